@@ -1 +0,0 @@
-import wallbox_control.main
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from operator import is_
+from types import MappingProxyType
+from typing import Any, ClassVar
 
 
 class LimitSource(str, Enum):
@@ -10,30 +13,46 @@ class LimitSource(str, Enum):
     MANUAL_REQUEST = "manual_request"
 
 
-@dataclass(slots=True)
+# Plain string values for decision origins, looked up once
+_MANUAL_REQUEST = LimitSource.MANUAL_REQUEST.value
+
+
+@dataclass(slots=True, frozen=True)
 class LimitSnapshot:
     source: LimitSource
     enforced: bool
     current_amps: float | None
     description: str
     details: dict[str, Any] = field(default_factory=dict)
-
-    def as_dict(self) -> dict[str, Any]:
-        return {
-            "source": self.source.value,
-            "enforced": self.enforced,
-            "current_amps": self.current_amps,
-            "description": self.description,
-            "details": self.details,
-        }
+    # Snapshots are immutable, so the dict form is built once. It is shared by
+    # every decision resolved from this snapshot, hence read-only.
+    _cached_dict: Mapping[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def as_dict(self) -> Mapping[str, Any]:
+        cached = self._cached_dict
+        if cached is None:
+            cached = MappingProxyType(
+                {
+                    "source": self.source.value,
+                    "enforced": self.enforced,
+                    "current_amps": self.current_amps,
+                    "description": self.description,
+                    "details": MappingProxyType(self.details),
+                }
+            )
+            object.__setattr__(self, "_cached_dict", cached)
+        return cached
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class LimitDecision:
     applied_current: float | None
     origin: str | None
     overridden: bool
-    snapshots: dict[str, dict[str, Any]]
+    # Read-only, as decisions and their snapshots are shared and reused
+    snapshots: Mapping[str, Mapping[str, Any]]
 
 
 class CurrentLimitManager:
@@ -41,10 +60,20 @@ class CurrentLimitManager:
         self._snapshots: dict[LimitSource, LimitSnapshot] = {}
         self._manual_request: float | None = None
         self._last_decision: LimitDecision | None = None
+        # Snapshot objects the last decision was resolved from
+        self._last_inputs: tuple[LimitSnapshot, ...] = ()
 
     def request_manual(self, value: float | None) -> LimitDecision:
+        if (
+            value == self._manual_request
+            and LimitSource.MANUAL_REQUEST in self._snapshots
+        ):
+            # Keep the active snapshot so the previous decision can be reused
+            return self._resolve()
         self._manual_request = value
-        description = "Manual request active" if value is not None else "Manual request cleared"
+        description = (
+            "Manual request active" if value is not None else "Manual request cleared"
+        )
         snapshot = LimitSnapshot(
             source=LimitSource.MANUAL_REQUEST,
             enforced=value is not None,
@@ -60,42 +89,55 @@ class CurrentLimitManager:
 
     def clear_source(self, source: LimitSource) -> LimitDecision:
         self._snapshots.pop(source, None)
-        if source == LimitSource.MANUAL_REQUEST:
+        if source is LimitSource.MANUAL_REQUEST:
             self._manual_request = None
         return self._resolve()
 
     def _resolve(self) -> LimitDecision:
-        # Get hardware limit (maximum allowed current)
-        hardware_limits = [
-            snap
-            for snap in self._snapshots.values()
-            if snap.source != LimitSource.MANUAL_REQUEST and snap.enforced and snap.current_amps is not None
-        ]
+        # The same snapshot objects always resolve to the same decision
+        inputs = tuple(self._snapshots.values())
+        if (
+            self._last_decision is not None
+            and len(inputs) == len(self._last_inputs)
+            and all(map(is_, inputs, self._last_inputs))
+        ):
+            return self._last_decision
+
+        # Get hardware limit (maximum allowed current) and its source in one pass
+        hw_max: float | None = None
+        hw_origin: str | None = None
+        for snap in self._snapshots.values():
+            if snap.source is LimitSource.MANUAL_REQUEST:
+                continue
+            if not snap.enforced or snap.current_amps is None:
+                continue
+            if hw_max is None or snap.current_amps < hw_max:
+                hw_max = snap.current_amps
+                hw_origin = snap.source.value
 
         # Get manual request (desired current)
         manual_snap = self._snapshots.get(LimitSource.MANUAL_REQUEST)
-        manual_current = manual_snap.current_amps if manual_snap and manual_snap.enforced else None
+        manual_current = (
+            manual_snap.current_amps if manual_snap and manual_snap.enforced else None
+        )
 
         # Determine applied current based on hardware limit and manual request
-        if hardware_limits and manual_current is not None:
+        origin: str | None
+        if hw_max is not None and manual_current is not None:
             # Both hardware limit and manual request exist
-            hw_max = min(snap.current_amps for snap in hardware_limits)
             applied_current = min(manual_current, hw_max)
-            origin = LimitSource.MANUAL_REQUEST.value
-            overridden = manual_current > hw_max  # Manual is overridden if it exceeds hardware limit
-        elif hardware_limits:
+            origin = _MANUAL_REQUEST
+            # Manual is overridden if it exceeds hardware limit
+            overridden = manual_current > hw_max
+        elif hw_max is not None:
             # Only hardware limit exists, no manual request
-            applied_current = min(snap.current_amps for snap in hardware_limits)
-            origin = next(
-                snap.source.value
-                for snap in hardware_limits
-                if snap.current_amps == applied_current
-            )
+            applied_current = hw_max
+            origin = hw_origin
             overridden = False
         elif manual_current is not None:
             # Only manual request exists, no hardware limit
             applied_current = manual_current
-            origin = LimitSource.MANUAL_REQUEST.value
+            origin = _MANUAL_REQUEST
             overridden = False
         else:
             # No limits at all
@@ -107,9 +149,12 @@ class CurrentLimitManager:
             applied_current=applied_current,
             origin=origin,
             overridden=overridden,
-            snapshots={src.value: snap.as_dict() for src, snap in self._snapshots.items()},
+            snapshots=MappingProxyType(
+                {src.value: snap.as_dict() for src, snap in self._snapshots.items()}
+            ),
         )
         self._last_decision = decision
+        self._last_inputs = inputs
         return decision
 
     def last_decision(self) -> LimitDecision | None:
@@ -124,39 +169,41 @@ class CurrentLimitManager:
                 "origin": decision.origin if decision else None,
                 "overridden": decision.overridden if decision else False,
             },
-            "sources": {src.value: snap.as_dict() for src, snap in self._snapshots.items()},
+            # Every change to the sources resolves a new decision, so its
+            # snapshots are always current.
+            "sources": decision.snapshots if decision else {},
         }
 
 
 class HardwareInputLimiter:
+    # Input level -> (current, mode, description)
+    _MODES: ClassVar[dict[bool, tuple[float, str, str]]] = {
+        False: (16.0, "normal_charge", "Hardware override: input 1 LOW -> 16A"),
+        True: (6.0, "reduced_charge", "Hardware override: input 1 HIGH -> 6A"),
+    }
+
     def __init__(self, pin_label: str = "GPIO6") -> None:
         self._pin_label = pin_label
         self._last_inputs: tuple[bool] | None = None
+        # One shared snapshot per input level, so unchanged inputs yield the
+        # same object and can be recognised by identity.
+        self._snapshots = {
+            level: LimitSnapshot(
+                source=LimitSource.HARDWARE_INPUT,
+                enforced=True,
+                current_amps=current,
+                description=description,
+                details={
+                    "inputs": MappingProxyType({pin_label: level}),
+                    "mode": mode,
+                },
+            )
+            for level, (current, mode, description) in self._MODES.items()
+        }
 
     def evaluate(self, first_high: bool) -> LimitSnapshot:
         self._last_inputs = (first_high,)
+        return self._snapshots[first_high]
 
-        if not first_high:
-            current = 16.0
-            mode = "normal_charge"
-            description = "Hardware override: input 1 LOW -> 16A"
-        else:
-            current = 6.0
-            mode = "reduced_charge"
-            description = "Hardware override: input 1 HIGH -> 6A"
-
-        return LimitSnapshot(
-            source=LimitSource.HARDWARE_INPUT,
-            enforced=True,
-            current_amps=current,
-            description=description,
-            details={
-                "inputs": {
-                    self._pin_label: first_high,
-                },
-                "mode": mode,
-            },
-        )
-
-    def last_inputs(self) -> tuple[bool, bool] | None:
+    def last_inputs(self) -> tuple[bool] | None:
         return self._last_inputs
@@ -1,7 +1,16 @@
+import atexit
 import logging
+import os
+import queue
+import signal
 import threading
 import time
-from contextlib import contextmanager
+import weakref
+from collections.abc import Callable
+from dataclasses import replace
+from functools import partial
+from logging.handlers import QueueHandler, QueueListener
+from operator import attrgetter
 from typing import Any
 
 from gpiozero import Button
@@ -12,7 +21,14 @@ from wallbox_control.limits import (
     HardwareInputLimiter,
     LimitDecision,
 )
-from wallbox_control.wallbox import Wallbox
+from wallbox_control.wallbox import POLL_SCHEDULE, Wallbox
+
+GPIO_BOUNCE_TIME = 0.02
+# Seconds between re-reads of the input, in case an edge was missed or debounced
+GPIO_RESYNC_INTERVAL = 5.0
+HARDWARE_INPUT_PRIORITY = 20
+
+_shutdown = threading.Event()
 
 
 class WallboxController:
@@ -23,7 +39,13 @@ class WallboxController:
     wallbox properties and automatically sends keepalive messages every 10 seconds.
     """
 
-    def __init__(self, port: str, address: int, keepalive_interval: float = 10.0):
+    def __init__(
+        self,
+        port: str,
+        address: int,
+        keepalive_interval: float = 10.0,
+        poll_interval: float = 1.0,
+    ):
         """
         Initialize the wallbox controller.
 
@@ -31,19 +53,38 @@ class WallboxController:
             port: Serial port path
             address: Modbus slave address of the wallbox
             keepalive_interval: Keepalive interval in seconds (max 10 seconds)
+            poll_interval: Seconds between background status polls
         """
         self.wallbox = Wallbox(port, address)
-        self._lock = threading.RLock()  # Reentrant lock for thread safety
+        self._lock = threading.Lock()  # Serializes access to the wallbox
+        self._lifecycle_lock = threading.Lock()  # Guards start/stop state
         self._keepalive_interval = min(
             keepalive_interval, 10.0
         )  # Ensure max 10 seconds
         self._keepalive_thread: threading.Thread | None = None
-        self._stop_keepalive = threading.Event()
+        self._hardware_input_thread: threading.Thread | None = None
+        self._poll_interval = poll_interval
+        self._poll_thread: threading.Thread | None = None
+        # (time.monotonic() when published, Wallbox.snapshot() values,
+        # property name -> time.monotonic() its value was read), replaced whole
+        self._status: tuple[float, dict[str, Any], dict[str, float]] | None = None
+        # Property name -> time.monotonic() of its last successful poll
+        self._polled_at: dict[str, float] = {}
+        self._stop_workers = threading.Event()
+        # Latest hardware input state waiting to be applied (latest value wins)
+        self._pending_hardware_input: bool | None = None
+        self._hardware_input_event = threading.Event()
         self._running = False
 
         # Store available properties for introspection
         self.GETTERS = self.wallbox.OWN_GETTERS
         self.SETTERS = self.wallbox.OWN_SETTERS
+        self._getters: dict[str, Callable[[Any], Any]] = {
+            name: attrgetter(name) for name in self.GETTERS
+        }
+        self._setters: dict[str, Callable[[Any], None]] = {
+            name: partial(setattr, self.wallbox, name) for name in self.SETTERS
+        }
 
         # Configure logging
         self.logger = logging.getLogger(__name__)
@@ -51,72 +92,192 @@ class WallboxController:
         self._hardware_limiter = HardwareInputLimiter()
         self._last_limit_decision: LimitDecision | None = None
         self._last_applied_current: float | None = None
-
-    @contextmanager
-    def _thread_safe_access(self):
-        """Context manager for thread-safe access to the wallbox."""
-        with self._lock:
-            yield
+        self._last_hardware_input: bool | None = None
+        # Signal the workers on collection/interpreter exit without touching self
+        self._finalizer = weakref.finalize(
+            self,
+            WallboxController._finalize,
+            self._stop_workers,
+            self._hardware_input_event,
+        )
 
     def start(self):
-        """Start the controller and begin keepalive messages."""
-        with self._lock:
+        """Start the controller, keepalive messages and hardware input updates."""
+        with self._lifecycle_lock:
             if self._running:
                 return
 
             self._running = True
-            self._stop_keepalive.clear()
+            self._stop_workers.clear()
 
             # Start keepalive thread
             self._keepalive_thread = threading.Thread(
                 target=self._keepalive_worker, daemon=True, name="WallboxKeepalive"
             )
             self._keepalive_thread.start()
+
+            # Start hardware input thread
+            self._hardware_input_thread = threading.Thread(
+                target=self._hardware_input_worker,
+                daemon=True,
+                name="WallboxHardwareInput",
+            )
+            self._hardware_input_thread.start()
+
+            # Start status poll thread
+            self._poll_thread = threading.Thread(
+                target=self._poll_worker, daemon=True, name="WallboxPoller"
+            )
+            self._poll_thread.start()
             self.logger.info(
                 "WallboxController started with keepalive interval: %.1fs",
                 self._keepalive_interval,
             )
 
     def stop(self):
-        """Stop the controller and halt keepalive messages."""
-        with self._lock:
+        """Stop the controller and its background threads."""
+        with self._lifecycle_lock:
             if not self._running:
                 return
 
             self._running = False
-            self._stop_keepalive.set()
+            self._stop_workers.set()
+            self._hardware_input_event.set()
 
-            if self._keepalive_thread and self._keepalive_thread.is_alive():
-                self._keepalive_thread.join(timeout=2.0)
+            for thread in (
+                self._keepalive_thread,
+                self._hardware_input_thread,
+                self._poll_thread,
+            ):
+                if thread and thread.is_alive():
+                    thread.join(timeout=2.0)
 
             self.logger.info("WallboxController stopped")
 
     def _keepalive_worker(self):
-        """Background thread that sends keepalive messages."""
-        while not self._stop_keepalive.is_set():
+        """
+        Background thread that sends keepalive messages.
+
+        Every Modbus transaction resets the wallbox's timeout, so a keepalive is
+        only sent once the bus has been idle for a full interval.
+        """
+        while True:
+            idle = time.monotonic() - self.wallbox.last_transaction_time
+            remaining = self._keepalive_interval - idle
+            if remaining <= 0:
+                try:
+                    with self._lock:
+                        version = self.wallbox.keepalive()
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug("Keepalive sent, version: %s", version)
+                except Exception:
+                    self.logger.exception("Keepalive failed")
+                remaining = self._keepalive_interval
+
+            # Wait until the next keepalive is due or until stop is requested
+            if self._stop_workers.wait(remaining):
+                return
+
+    def _poll_worker(self):
+        """
+        Background thread that keeps the published wallbox status fresh.
+
+        Each property is re-read once its POLL_SCHEDULE interval has passed
+        (every tick if it has none); properties scheduled as None are read once.
+        """
+        while True:
             try:
-                with self._thread_safe_access():
-                    # Send keepalive by reading the modbus register layout version
-                    version = self.wallbox.modbus_register_layout_version
-                    self.logger.debug("Keepalive sent, version: %s", version)
+                self._refresh_status(self._due_properties(time.monotonic()))
             except Exception:
-                self.logger.exception("Keepalive failed")
+                self.logger.exception("Status poll failed")
+            if self._stop_workers.wait(self._poll_interval):
+                return
 
-            # Wait for the specified interval or until stop is requested
-            self._stop_keepalive.wait(self._keepalive_interval)
+    def _due_properties(self, now: float) -> list[str]:
+        """Return the properties whose poll interval has passed at time now."""
+        due = []
+        for name in self.GETTERS:
+            last = self._polled_at.get(name)
+            interval = POLL_SCHEDULE.get(name, 0.0)
+            if last is None or (interval is not None and now - last >= interval):
+                due.append(name)
+        return due
+
+    def _refresh_status(
+        self, names: list[str] | None = None
+    ) -> tuple[float, dict[str, Any], dict[str, float]]:
+        """
+        Read wallbox properties and publish them for get_all_properties.
+
+        Args:
+            names: Properties to read and merge into the published status;
+                all properties if None
+        """
+        # Hold the lock until the status is published, so a concurrent write
+        # can't un-stamp its property in between and be overwritten here
+        with self._lock:
+            previous = self._status
+            if names is None or previous is None:
+                fresh = values = self.wallbox.snapshot()
+                read_at = {}
+            elif names:
+                fresh = self.wallbox.snapshot(names)
+                values = {**previous[1], **fresh}
+                read_at = dict(previous[2])
+            else:
+                fresh, values, read_at = {}, previous[1], previous[2]
+
+            now = time.monotonic()
+            for name, value in fresh.items():
+                # Failed reads stay due so the next poll retries them
+                if not isinstance(value, Exception):
+                    self._polled_at[name] = now
+                    read_at[name] = now
+            self._status = status = (now, values, read_at)
+        return status
+
+    def _hardware_input_worker(self):
+        """Background thread that applies the latest submitted hardware input."""
+        _prioritize_current_thread(self.logger)
+        last_target: float | None = None
+        while True:
+            self._hardware_input_event.wait()
+            self._hardware_input_event.clear()
+            if self._stop_workers.is_set():
+                return
+
+            state = self._pending_hardware_input
+            if state is None:
+                continue
+
+            try:
+                decision = self.update_hardware_input(state)
+            except Exception:
+                self.logger.exception("Failed to apply hardware input")
+                continue
+
+            target = decision.applied_current
+            if target != last_target:
+                formatted = f"{target:.1f}" if target is not None else "n/a"
+                self.logger.info("Hardware input %s -> %sA", state, formatted)
+                last_target = target
 
     def _apply_decision(self, decision: LimitDecision) -> float | None:
         target = decision.applied_current
         if target is None:
             return None
 
-        if self._last_applied_current is not None and abs(self._last_applied_current - target) < 0.05:
+        if (
+            self._last_applied_current is not None
+            and abs(self._last_applied_current - target) < 0.05
+        ):
             return target
 
         origin = decision.origin or "unknown"
         try:
             self.wallbox.max_current = target
             self._last_applied_current = target
+            self._polled_at.pop("max_current", None)
             log_level = logging.INFO if decision.overridden else logging.DEBUG
             self.logger.log(
                 log_level,
@@ -132,6 +293,15 @@ class WallboxController:
             )
             return None
 
+    def _record_decision(self, decision: LimitDecision) -> LimitDecision:
+        """Apply a decision and remember what was actually applied."""
+        applied = self._apply_decision(decision)
+        if applied != decision.applied_current:
+            # The limit manager keeps its own decision; report ours separately
+            decision = replace(decision, applied_current=applied)
+        self._last_limit_decision = decision
+        return decision
+
     def __enter__(self):
         """Context manager entry."""
         self.start()
@@ -141,123 +311,13 @@ class WallboxController:
         """Context manager exit."""
         self.stop()
 
-    def __del__(self):
-        """Destructor to ensure cleanup."""
-        self.stop()
+    @staticmethod
+    def _finalize(stop_workers: threading.Event, wake_event: threading.Event) -> None:
+        """Ask the background threads to exit; never takes a lock or joins."""
+        stop_workers.set()
+        wake_event.set()
 
-    # Thread-safe property accessors - Read-only properties
-    def get_modbus_register_layout_version(self) -> str:
-        """Get the Modbus register layout version (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.modbus_register_layout_version
-
-    def get_charging_state(self):
-        """Get the current charging state (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.charging_state
-
-    def get_l1_rms(self) -> float:
-        """Get the RMS voltage of L1 (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.L1_rms
-
-    def get_l2_rms(self) -> float:
-        """Get the RMS voltage of L2 (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.L2_rms
-
-    def get_l3_rms(self) -> float:
-        """Get the RMS voltage of L3 (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.L3_rms
-
-    def get_pcb_temperature(self) -> float:
-        """Get the PCB temperature (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.pcb_temperature
-
-    def get_voltage_l1(self) -> float:
-        """Get the voltage of L1 (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.voltage_L1
-
-    def get_voltage_l2(self) -> float:
-        """Get the voltage of L2 (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.voltage_L2
-
-    def get_voltage_l3(self) -> float:
-        """Get the voltage of L3 (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.voltage_L3
-
-    def get_ext_lock_state(self) -> bool:
-        """Get the external lock state (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.ext_lock_state
-
-    def get_power_overall(self) -> int:
-        """Get the overall power (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.power_overall
-
-    def get_energy_since_power_on(self) -> int:
-        """Get the energy consumed since power on in VAh (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.energy_since_power_on
-
-    def get_energy_since_installation(self) -> int:
-        """Get the energy consumed since installation in VAh (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.energy_since_installation
-
-    def get_hardware_max_current(self) -> int:
-        """Get the hardware maximum current (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.hardware_max_current
-
-    def get_hardware_min_current(self) -> int:
-        """Get the hardware minimum current (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.hardware_min_current
-
-    def get_modbus_timeout(self) -> int:
-        """Get the Modbus timeout in milliseconds (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.modbus_timeout
-
-    def set_modbus_timeout(self, value: int) -> bool:
-        """Set the Modbus timeout in milliseconds (thread-safe)."""
-        with self._thread_safe_access():
-            self.wallbox.modbus_timeout = value
-            return True
-
-    def get_standby_control(self) -> bool:
-        """Get the standby control state (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.standby_control
-
-    def set_standby_control(self, value: bool) -> bool:
-        """Set the standby control state (thread-safe)."""
-        with self._thread_safe_access():
-            self.wallbox.standby_control = value
-            return True
-
-    def get_remote_lock(self) -> bool:
-        """Get the remote lock state (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.remote_lock
-
-    def set_remote_lock(self, value: bool) -> bool:
-        """Set the remote lock state (thread-safe)."""
-        with self._thread_safe_access():
-            self.wallbox.remote_lock = value
-            return True
-
-    def get_max_current(self) -> float:
-        """Get the maximum current in Amperes (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.max_current
+    # Per-property get_*/set_* accessors are generated below the class
 
     def set_max_current(self, value: float) -> bool:
         """Set the maximum current in Amperes (thread-safe)."""
@@ -266,121 +326,242 @@ class WallboxController:
 
     def request_manual_max_current(self, value: float) -> LimitDecision:
         """Request a manual maximum current and apply current limits."""
-        with self._thread_safe_access():
+        with self._lock:
             decision = self._limit_manager.request_manual(value)
-            self._last_limit_decision = decision
-            applied = self._apply_decision(decision)
-            decision.applied_current = applied
-            return decision
+            return self._record_decision(decision)
 
-    def update_hardware_input(self, gpio13_high: bool) -> LimitDecision:
+    def submit_hardware_input(self, input_high: bool) -> None:
+        """
+        Hand a hardware input state to the background hardware input thread.
+
+        Only the most recent state is applied, so edges that arrive while a
+        Modbus write is in flight collapse into a single update. Requires the
+        controller to be started.
+        """
+        self._pending_hardware_input = input_high
+        self._hardware_input_event.set()
+
+    def update_hardware_input(self, input_high: bool) -> LimitDecision:
         """Update the hardware input override state and apply resulting limits."""
-        with self._thread_safe_access():
-            snapshot = self._hardware_limiter.evaluate(gpio13_high)
+        last_decision = self._last_limit_decision
+        if (
+            input_high == self._last_hardware_input
+            and last_decision is not None
+            and last_decision.applied_current is not None
+        ):
+            # Spurious edge: same input and the last decision reached the wallbox
+            return last_decision
+
+        with self._lock:
+            snapshot = self._hardware_limiter.evaluate(input_high)
             decision = self._limit_manager.apply_override_snapshot(snapshot)
-            self._last_limit_decision = decision
-            applied = self._apply_decision(decision)
-            decision.applied_current = applied
-            return decision
+            self._last_hardware_input = input_high
+            return self._record_decision(decision)
 
     def get_limit_debug(self) -> dict[str, Any]:
         """Return internal current limit debug information."""
-        with self._thread_safe_access():
+        with self._lock:
             return self._limit_manager.debug_snapshot()
 
-    def get_failsafe_current(self) -> float:
-        """Get the failsafe current in Amperes (thread-safe)."""
-        with self._thread_safe_access():
-            return self.wallbox.failsafe_current
-
-    def set_failsafe_current(self, value: float) -> bool:
-        """Set the failsafe current in Amperes (thread-safe)."""
-        with self._thread_safe_access():
-            self.wallbox.failsafe_current = value
-            return True
-
     # Generic property access methods
     def get_property(self, property_name: str):
         """Get any wallbox property by name (thread-safe)."""
-        if property_name not in self.GETTERS:
+        getter = self._getters.get(property_name)
+        if getter is None:
             raise AttributeError(
                 f"Property '{property_name}' is not a readable property"
             )
 
-        with self._thread_safe_access():
-            return getattr(self.wallbox, property_name)
+        with self._lock:
+            return getter(self.wallbox)
 
     def set_property(self, property_name: str, value) -> bool:
         """Set any wallbox property by name (thread-safe)."""
-        if property_name not in self.SETTERS:
+        setter = self._setters.get(property_name)
+        if setter is None:
             raise AttributeError(
                 f"Property '{property_name}' is not a writable property"
             )
 
-        with self._thread_safe_access():
-            setattr(self.wallbox, property_name, value)
+        with self._lock:
+            setter(value)
+            # Have the poll thread pick up the new value on its next tick
+            self._polled_at.pop(property_name, None)
             return True
 
     def get_all_properties(self) -> dict:
-        """Get all readable properties as a dictionary (thread-safe)."""
-        result = {}
-        with self._thread_safe_access():
-            for prop_name in self.GETTERS:
-                try:
-                    result[prop_name] = getattr(self.wallbox, prop_name)
-                except Exception as e:
-                    result[prop_name] = f"Error: {e}"
-            result["current_limit"] = self._limit_manager.debug_snapshot()
+        """
+        Get all readable properties as a dictionary (thread-safe).
+
+        Values come from the status published by the poll thread, so this does
+        not touch the bus. The wallbox is only read directly if no status has
+        been published yet, or if the poll thread isn't running (controller not
+        started) and the status is more than two poll intervals old. A stale
+        status from a running poller (say, while the bus is failing) is served
+        as is, with its real age.
+        snapshot_age reports how many seconds ago the oldest of the regularly
+        polled values was read; values read only once (POLL_SCHEDULE None)
+        don't go stale and are left out.
+        """
+        status = self._status
+        poller = self._poll_thread
+        if status is None or (
+            (poller is None or not poller.is_alive())
+            and time.monotonic() - status[0] > 2 * self._poll_interval
+        ):
+            status = self._refresh_status()
+        published_at, values, read_at = status
+
+        with self._lock:
+            limit_debug = self._limit_manager.debug_snapshot()
+
+        result: dict[str, Any] = {
+            name: f"Error: {value}" if isinstance(value, Exception) else value
+            for name, value in values.items()
+        }
+        result["current_limit"] = limit_debug
+        now = time.monotonic()
+        oldest = min(
+            (
+                read_at[name]
+                for name in values
+                if name in read_at and POLL_SCHEDULE.get(name, 0.0) is not None
+            ),
+            default=published_at,
+        )
+        result["snapshot_age"] = now - oldest
         return result
 
 
-def gpio_worker(wallbox_controller: WallboxController):
+def _prioritize_current_thread(logger: logging.Logger) -> None:
+    """
+    Move the calling thread to SCHED_FIFO and pin it to one core (best effort).
+
+    Keeps hardware input handling responsive while the web server is busy.
+    Needs Linux and CAP_SYS_NICE; otherwise the thread keeps its defaults. The
+    thread is only pinned once the priority boost succeeded, so it is never
+    left on a single core without it.
+    """
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(HARDWARE_INPUT_PRIORITY))
+    except (AttributeError, OSError) as exc:
+        logger.debug("Could not raise hardware input thread priority: %s", exc)
+        return
+    try:
+        os.sched_setaffinity(0, {max(os.sched_getaffinity(0))})
+    except OSError as exc:
+        logger.debug("Could not pin hardware input thread: %s", exc)
+
+
+def _add_property_accessors(cls: type[WallboxController]) -> None:
+    """
+    Install a thread-safe get_<name>/set_<name> method for every Wallbox property.
+
+    Methods already defined on the class (such as set_max_current, which goes
+    through the current limit manager) are left untouched.
+    """
+
+    def make_getter(name: str) -> Callable[[WallboxController], Any]:
+        read = attrgetter(name)
+
+        def getter(self: WallboxController) -> Any:
+            with self._lock:
+                return read(self.wallbox)
+
+        return getter
+
+    def make_setter(name: str) -> Callable[[WallboxController, Any], bool]:
+        def setter(self: WallboxController, value: Any) -> bool:
+            return self.set_property(name, value)
+
+        return setter
+
+    accessors: list[tuple[str, str, Callable[[str], Callable[..., Any]]]] = [
+        ("get", name, make_getter) for name in Wallbox.OWN_GETTERS
+    ]
+    accessors += [("set", name, make_setter) for name in Wallbox.OWN_SETTERS]
+    for prefix, name, factory in accessors:
+        method_name = f"{prefix}_{name.lower()}"
+        if method_name in cls.__dict__:
+            continue
+        method = factory(name)
+        method.__name__ = method_name
+        method.__qualname__ = f"{cls.__qualname__}.{method_name}"
+        method.__doc__ = (
+            f"{prefix.capitalize()} the wallbox {name} property (thread-safe)."
+        )
+        setattr(cls, method_name, method)
+
+
+_add_property_accessors(WallboxController)
+
+
+def gpio_worker(
+    wallbox_controller: WallboxController,
+    stop_event: threading.Event | None = None,
+):
+    """
+    Forward hardware input changes to the wallbox controller as they happen.
+
+    The button's edge callbacks submit the new state as it changes. Between
+    edges the worker re-submits the current state every GPIO_RESYNC_INTERVAL
+    seconds until stop_event is set (or forever if none is given), so a missed
+    or debounced final edge can't leave the wrong limit applied. Unchanged
+    inputs are cheap for the controller to skip.
+    """
     logger = logging.getLogger("GPIO_worker")
 
     try:
-        button1 = Button("GPIO6", pull_up=False)
+        button1 = Button("GPIO6", pull_up=False, bounce_time=GPIO_BOUNCE_TIME)
     except Exception:
         logger.exception("Failed to initialize GPIO buttons")
         return
 
-    last_state_1 = None
-    last_target: float | None = None
+    def _on_edge() -> None:
+        wallbox_controller.submit_hardware_input(button1.is_pressed)
+
+    button1.when_pressed = _on_edge
+    button1.when_released = _on_edge
     logger.info("Started GPIO worker")
+    # Apply the state the input is in before the first edge arrives
+    _on_edge()
 
-    while True:
-        try:
-            time.sleep(0.5)
-            state1 = button1.is_pressed
+    stop_event = stop_event or threading.Event()
+    while not stop_event.wait(GPIO_RESYNC_INTERVAL):
+        _on_edge()
+    button1.close()
 
-            if last_state_1 == state1:
-                continue
-            last_state_1 = state1
 
-            try:
-                decision = wallbox_controller.update_hardware_input(state1)
-                target = decision.applied_current
-                if target != last_target:
-                    formatted = f"{target:.1f}" if target is not None else "n/a"
-                    logger.info(
-                        "Hardware inputs -> %sA (GPIO13=%s, GPIO14=%s)",
-                        formatted,
-                        state1,
-                    )
-                    last_target = target
-            except Exception:
-                logger.exception("Failed to set wallbox current")
+def _configure_logging() -> None:
+    """
+    Route log records through a queue to a background listener.
 
-        except Exception:
-            logger.exception("GPIO worker error")
-            time.sleep(1.0)  # Wait before retrying to prevent rapid error loops
+    Log output (console, container log driver) can block. Handing records to a
+    queue keeps that off the GPIO, keepalive and web server threads.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    queue_handler = QueueHandler(log_queue)
+    # The listener's handler applies the real format; only merge the message here
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+
+
+def _request_shutdown(signum: int, frame: Any) -> None:
+    """Signal handler that wakes the parked main thread."""
+    _shutdown.set()
 
 
 def main():
     # Configure logging to see keepalive messages
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+    _configure_logging()
 
     install_global_exception_logging(logging.getLogger(__name__))
 
@@ -389,7 +570,9 @@ def main():
     try:
         # Create controller
         controller = WallboxController(
-            port="/dev/serial/by-id/usb-FTDI_FT232R_USB_UART_BG018W3B-if00-port0", address=1, keepalive_interval=8.0
+            port="/dev/serial/by-id/usb-FTDI_FT232R_USB_UART_BG018W3B-if00-port0",
+            address=1,
+            keepalive_interval=8.0,
         )
         controller.start()
         logger.info("Wallbox controller started successfully")
@@ -400,7 +583,7 @@ def main():
     try:
         # Start GPIO worker thread
         gpio_worker_thread = threading.Thread(
-            target=gpio_worker, args=(controller,), daemon=True
+            target=gpio_worker, args=(controller, _shutdown), daemon=True
         )
         gpio_worker_thread.start()
         logger.info("GPIO worker thread started")
@@ -423,11 +606,12 @@ def main():
         controller.stop()
         return
 
+    signal.signal(signal.SIGINT, _request_shutdown)
+    signal.signal(signal.SIGTERM, _request_shutdown)
+
     try:
-        # Keep main thread alive
-        while True:
-            threading.Event().wait(1.0)
-    except KeyboardInterrupt:
+        # Park the main thread until SIGINT/SIGTERM asks us to shut down
+        _shutdown.wait()
         logging.info("\nShutting down...")
         controller.stop()
     except Exception:
@@ -1,6 +1,8 @@
 import logging
+import math
 import time
-from enum import Enum
+from enum import IntEnum
+from typing import ClassVar
 
 import minimalmodbus
 import serial
@@ -9,12 +11,14 @@ DEFAULT_BAUDRATE = 19200
 DEFAULT_BYTESIZE = 8
 DEFAULT_STOPBITS = 1
 DEFAULT_PARITY = minimalmodbus.serial.PARITY_EVEN
+DEFAULT_TIMEOUT = 0.1  # seconds; responses take ~20 ms at 19200 baud
 WRITE_HOLDING_REGISTER = 6
 MAX_RECONNECT_ATTEMPTS = 3
 RECONNECT_DELAY = 0.5  # seconds
+READ_CACHE_TTL = 0.1  # seconds
 
 
-class ModbusFunctionCode(Enum):
+class ModbusFunctionCode(IntEnum):
     READ_HOLDING_REGISTER = 3
     READ_INPUT_REGISTER = 4
 
@@ -22,6 +26,10 @@ class ModbusFunctionCode(Enum):
 class WallboxInstrument(minimalmodbus.Instrument):
     """Wallbox Modbus interface for reading and writing wallbox parameters"""
 
+    # (function code, register) -> seconds a read value stays cached, for
+    # registers that need something other than the defaults in _read_register
+    REGISTER_TTL: ClassVar[dict[tuple[int, int], float]] = {}
+
     def __init__(self, serial_port: str, slave_address: int):
         """
         Initialize the Wallbox Modbus interface.
@@ -34,6 +42,14 @@ class WallboxInstrument(minimalmodbus.Instrument):
         self._slave_address = slave_address
         super().__init__(serial_port, slave_address)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # time.monotonic() of the last successful Modbus transaction
+        self.last_transaction_time = 0.0
+        # (function code, register) -> (expiry time, value) for recent reads.
+        # Callers are expected to serialize access, as WallboxController does.
+        self._read_cache: dict[tuple[int, int], tuple[float, int]] = {}
+        # Register address -> value last written successfully (write shadow)
+        self._written_values: dict[int, int] = {}
+        self.read_cache_ttl = READ_CACHE_TTL
         self._configure_serial()
 
     def _configure_serial(self) -> None:
@@ -42,7 +58,26 @@ class WallboxInstrument(minimalmodbus.Instrument):
         self.serial.bytesize = DEFAULT_BYTESIZE
         self.serial.parity = DEFAULT_PARITY
         self.serial.stopbits = DEFAULT_STOPBITS
+        self.serial.timeout = DEFAULT_TIMEOUT
         self.mode = minimalmodbus.MODE_RTU
+        self._enable_low_latency()
+
+    def _enable_low_latency(self) -> None:
+        """
+        Ask the tty driver to hand over received bytes immediately.
+
+        USB serial adapters (FTDI in particular) otherwise hold incoming bytes
+        for up to 16 ms before passing them on, which adds to every Modbus
+        round trip. Not all drivers support this, so failures are ignored.
+        For FTDI adapters the same can be made permanent with
+        ``echo 1 > /sys/bus/usb-serial/devices/ttyUSB0/latency_timer``.
+        """
+        try:
+            self.serial.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, ValueError) as exc:
+            self.logger.debug(
+                "Low latency mode not available on %s: %s", self._serial_port, exc
+            )
 
     def _reconnect_serial(self) -> bool:
         """
@@ -53,7 +88,7 @@ class WallboxInstrument(minimalmodbus.Instrument):
         """
         try:
             # Close existing connection if it exists
-            if hasattr(self, 'serial') and self.serial and self.serial.is_open:
+            if hasattr(self, "serial") and self.serial and self.serial.is_open:
                 try:
                     self.serial.close()
                 except Exception:
@@ -69,11 +104,16 @@ class WallboxInstrument(minimalmodbus.Instrument):
                 bytesize=DEFAULT_BYTESIZE,
                 parity=DEFAULT_PARITY,
                 stopbits=DEFAULT_STOPBITS,
-                timeout=1.0
+                timeout=DEFAULT_TIMEOUT,
             )
             self.mode = minimalmodbus.MODE_RTU
+            self._enable_low_latency()
+            # The wallbox may have restarted while the link was down
+            self.invalidate_cache()
 
-            self.logger.info("Successfully reconnected to serial port %s", self._serial_port)
+            self.logger.info(
+                "Successfully reconnected to serial port %s", self._serial_port
+            )
             return True
 
         except Exception as exc:
@@ -95,78 +135,166 @@ class WallboxInstrument(minimalmodbus.Instrument):
         Raises:
             RuntimeError: If operation fails after all reconnection attempts
         """
-        last_exception = None
+        try:
+            result = operation(*args, **kwargs)
+        except minimalmodbus.SlaveReportedException:
+            # The wallbox answered, so the link is fine; reconnecting won't help
+            raise
+        except (OSError, serial.SerialException) as exc:
+            return self._recover_and_retry(exc, operation, *args, **kwargs)
+        self.last_transaction_time = time.monotonic()
+        return result
+
+    def _recover_and_retry(self, exc: Exception, operation, *args, **kwargs):
+        """
+        Reconnect the serial port and retry an operation that failed with exc.
+
+        Raises:
+            RuntimeError: If operation fails after all reconnection attempts
+        """
+        last_exception = exc
+        for attempt in range(1, MAX_RECONNECT_ATTEMPTS):
+            self.logger.warning(
+                "Serial port error on attempt %d/%d: %s - attempting reconnection",
+                attempt,
+                MAX_RECONNECT_ATTEMPTS,
+                last_exception,
+            )
+            if not self._reconnect_serial():
+                self.logger.error(
+                    "Reconnection failed on attempt %d/%d",
+                    attempt,
+                    MAX_RECONNECT_ATTEMPTS,
+                )
+                continue
 
-        for attempt in range(MAX_RECONNECT_ATTEMPTS):
             try:
-                return operation(*args, **kwargs)
-
-            except (OSError, serial.SerialException) as exc:
-                # These exceptions indicate serial port issues that might be fixable with reconnection
-                last_exception = exc
-
-                if attempt < MAX_RECONNECT_ATTEMPTS - 1:
-                    self.logger.warning(
-                        "Serial port error on attempt %d/%d: %s - attempting reconnection",
-                        attempt + 1,
-                        MAX_RECONNECT_ATTEMPTS,
-                        exc
-                    )
-
-                    if not self._reconnect_serial():
-                        self.logger.error("Reconnection failed on attempt %d/%d", attempt + 1, MAX_RECONNECT_ATTEMPTS)
-                        continue
-                else:
-                    self.logger.error(
-                        "Serial port error persists after %d attempts: %s",
-                        MAX_RECONNECT_ATTEMPTS,
-                        exc
-                    )
-
-            except Exception:
-                # For other exceptions, don't retry
+                result = operation(*args, **kwargs)
+            except minimalmodbus.SlaveReportedException:
                 raise
-
-        # If we get here, all retry attempts failed
+            except (OSError, serial.SerialException) as retry_exc:
+                last_exception = retry_exc
+                continue
+            self.last_transaction_time = time.monotonic()
+            return result
+
+        self.logger.error(
+            "Serial port error persists after %d attempts: %s",
+            MAX_RECONNECT_ATTEMPTS,
+            last_exception,
+        )
         raise RuntimeError(
             f"Failed to execute operation after {MAX_RECONNECT_ATTEMPTS} attempts"
         ) from last_exception
 
+    def invalidate_cache(self) -> None:
+        """Forget all cached register values so the next reads go to the wallbox."""
+        self._read_cache.clear()
+        self._written_values.clear()
+
+    def _cached_value(self, key: tuple[int, int]) -> int | None:
+        """Return the cached value for key, or None if it is missing or expired."""
+        cached = self._read_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+
+    def _cache_value(self, key: tuple[int, int], value: int) -> None:
+        """Remember a value read from the wallbox for the register's TTL."""
+        ttl = self.REGISTER_TTL.get(key)
+        if ttl is None:
+            # Holding registers only change when we write them
+            if key[0] == ModbusFunctionCode.READ_HOLDING_REGISTER:
+                ttl = math.inf
+            else:
+                ttl = self.read_cache_ttl
+        self._read_cache[key] = (time.monotonic() + ttl, value)
+
     def _read_register(
         self,
         register_address: int,
         function_code: ModbusFunctionCode,
+        use_cache: bool = True,
     ) -> int:
         """
         Read a register using the specified container type.
 
+        Input register values read within the last read_cache_ttl seconds are
+        returned from the cache instead of issuing another Modbus request.
+        Holding registers only change when written, so their values are kept
+        until the next write or invalidate_cache(). REGISTER_TTL overrides
+        either default per register.
+
         Args:
             register_address: The register address to read from
             function_code: The Modbus function code to use
+            use_cache: Set to False to always read from the wallbox
 
         Returns:
             The value read from the register
         """
+        key = (function_code, register_address)
+        if use_cache:
+            cached = self._cached_value(key)
+            if cached is not None:
+                return cached
+
         try:
-            return self._execute_with_reconnect(
-                self.read_register,
-                register_address,
-                0,
-                function_code.value
+            value = self._execute_with_reconnect(
+                self.read_register, register_address, 0, function_code
             )
         except Exception as exc:
-            logger = getattr(
-                self,
-                "logger",
-                logging.getLogger(f"{__name__}.{self.__class__.__name__}"),
-            )
-            logger.exception(
-                "Failed to read register %s with function %s", register_address, function_code
+            self.logger.exception(
+                "Failed to read register %s with function %s",
+                register_address,
+                function_code,
             )
             raise RuntimeError(
                 f"Failed to read register {register_address}: {exc}"
             ) from exc
 
+        self._cache_value(key, value)
+        return value
+
+    def _read_registers(
+        self,
+        start_address: int,
+        count: int,
+        function_code: ModbusFunctionCode,
+    ) -> list[int]:
+        """
+        Read a block of adjacent registers in a single Modbus request.
+
+        The values are also stored in the read cache, so single register reads
+        that follow can be answered without another request.
+
+        Args:
+            start_address: The first register address to read from
+            count: The number of registers to read
+            function_code: The Modbus function code to use
+
+        Returns:
+            The register values, starting with the value at start_address
+        """
+        try:
+            values = self._execute_with_reconnect(
+                self.read_registers, start_address, count, function_code
+            )
+        except Exception as exc:
+            self.logger.exception(
+                "Failed to read %s registers from %s with function %s",
+                count,
+                start_address,
+                function_code,
+            )
+            raise RuntimeError(
+                f"Failed to read registers {start_address}-{start_address + count - 1}: {exc}"
+            ) from exc
+
+        for offset, value in enumerate(values):
+            self._cache_value((function_code, start_address + offset), value)
+        return values
+
     def _read_32bit_from_registers(
         self,
         high_register: int,
@@ -174,7 +302,9 @@ class WallboxInstrument(minimalmodbus.Instrument):
         function_code: ModbusFunctionCode,
     ) -> int:
         """
-        Read a 32-bit value from two 16-bit registers.
+        Read a 32-bit value from two adjacent 16-bit registers in one request.
+
+        Both halves are served from the read cache when they are still fresh.
 
         Args:
             high_register: Register address containing the high 16 bits
@@ -184,20 +314,24 @@ class WallboxInstrument(minimalmodbus.Instrument):
         Returns:
             The 32-bit value constructed from the two registers
         """
-        def _read_both_registers():
-            high_value = self.read_register(high_register, 0, function_code.value)
-            low_value = self.read_register(low_register, 0, function_code.value)
+        if low_register != high_register + 1:
+            raise ValueError(
+                f"32-bit registers must be adjacent, got {high_register},{low_register}"
+            )
+
+        high_key = (function_code, high_register)
+        low_key = (function_code, low_register)
+        high_value = self._cached_value(high_key)
+        low_value = self._cached_value(low_key)
+        if high_value is not None and low_value is not None:
             return (high_value << 16) + low_value
 
         try:
-            return self._execute_with_reconnect(_read_both_registers)
-        except Exception as exc:
-            logger = getattr(
-                self,
-                "logger",
-                logging.getLogger(f"{__name__}.{self.__class__.__name__}"),
+            high_value, low_value = self._execute_with_reconnect(
+                self.read_registers, high_register, 2, function_code
             )
-            logger.exception(
+        except Exception as exc:
+            self.logger.exception(
                 "Failed to read 32-bit register pair (%s, %s) with function %s",
                 high_register,
                 low_register,
@@ -206,19 +340,34 @@ class WallboxInstrument(minimalmodbus.Instrument):
             raise RuntimeError(
                 f"Failed to read 32-bit value from registers {high_register},{low_register}: {exc}"
             ) from exc
+        self._cache_value(high_key, high_value)
+        self._cache_value(low_key, low_value)
+        return (high_value << 16) + low_value
 
-    def _write_register(self, register_address: int, value: int) -> bool:
+    def _write_register(
+        self, register_address: int, value: int, verify: bool = False
+    ) -> bool:
         """
         Write a value to a register using the specified value type.
 
+        minimalmodbus already checks the echo returned for function code 6,
+        so a successful write needs no extra read unless ``verify`` is set.
+        A write is skipped only if the same value was last written successfully
+        and a fresh cached read still shows it, so a register the wallbox
+        changed on its own (e.g. failsafe fallback) is written again.
+
         Args:
             register_address: The register address to write to
             value: The ModbusValue containing both the value and type information
+            verify: Read the register back and compare it with ``value``
         """
+
         def _write_and_verify():
             self.write_register(register_address, value, 0, WRITE_HOLDING_REGISTER)
+            if not verify:
+                return True
             v = self.read_register(
-                register_address, 0, ModbusFunctionCode.READ_HOLDING_REGISTER.value
+                register_address, 0, ModbusFunctionCode.READ_HOLDING_REGISTER
             )
             if v != value:
                 message = (
@@ -228,17 +377,25 @@ class WallboxInstrument(minimalmodbus.Instrument):
                 raise RuntimeError(message)
             return True
 
+        key = (ModbusFunctionCode.READ_HOLDING_REGISTER, register_address)
+        if (
+            not verify
+            and self._written_values.get(register_address) == value
+            and self._cached_value(key) == value
+        ):
+            return True
+        self._read_cache.pop(key, None)
+        self._written_values.pop(register_address, None)
         try:
-            return self._execute_with_reconnect(_write_and_verify)
+            result = self._execute_with_reconnect(_write_and_verify)
         except Exception as exc:
-            logger = getattr(
-                self,
-                "logger",
-                logging.getLogger(f"{__name__}.{self.__class__.__name__}"),
-            )
-            logger.exception(
+            self.logger.exception(
                 "Failed to write register %s with value %s", register_address, value
             )
             raise RuntimeError(
                 f"Failed to write value {value} to register {register_address}: {exc}"
             ) from exc
+        # The wallbox echoed the value, so it is what a read would return now
+        self._written_values[register_address] = value
+        self._cache_value(key, value)
+        return result
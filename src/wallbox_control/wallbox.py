@@ -1,5 +1,9 @@
+import math
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from typing import ClassVar
+from typing import Any, ClassVar
+
+import minimalmodbus
 
 from wallbox_control.modbus import (
     ModbusFunctionCode,
@@ -7,134 +11,477 @@ from wallbox_control.modbus import (
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WallboxChargingState:
     state: str
     description_car: str
     description_wb: str
 
 
-WALLBOX_CHARGING_STATES = {
-    2: WallboxChargingState("A1", "No vehicle plugged", "None"),
-    3: WallboxChargingState("A2", "No vehicle plugged", "Allows charging"),
-    4: WallboxChargingState(
+# Indexed by the charging state register value; 0 and 1 are not used.
+WALLBOX_CHARGING_STATES: tuple[WallboxChargingState | None, ...] = (
+    None,
+    None,
+    WallboxChargingState("A1", "No vehicle plugged", "None"),
+    WallboxChargingState("A2", "No vehicle plugged", "Allows charging"),
+    WallboxChargingState(
         "B1", "Vehicle plugged without charging request", "Doesn't allow charging"
     ),
-    5: WallboxChargingState(
+    WallboxChargingState(
         "B2", "Vehicle plugged without charging request", "Allows charging"
     ),
-    6: WallboxChargingState(
+    WallboxChargingState(
         "C1", "Vehicle plugged with charging request", "Doesn't allow charging"
     ),
-    7: WallboxChargingState(
+    WallboxChargingState(
         "C2", "Vehicle plugged with charging request", "Allows charging"
     ),
-    8: WallboxChargingState("derating", "None", "None"),
-    9: WallboxChargingState("E", "None", "None"),
-    10: WallboxChargingState("F", "None", "None"),
-    11: WallboxChargingState("Error", "None", "None"),
-}
+    WallboxChargingState("derating", "None", "None"),
+    WallboxChargingState("E", "None", "None"),
+    WallboxChargingState("F", "None", "None"),
+    WallboxChargingState("Error", "None", "None"),
+)
 
 
-def fit_uint16(value: int) -> int:
-    if value < 0:
-        value = 0
-    elif value > 65_535:
-        value = 65_535
+# Modbus RTU allows up to 125 registers per read; stay a little below that.
+MAX_REGISTERS_PER_READ = 120
+
+# Allowed current settings in tenths of an Ampere (6A-16A); 0 is also accepted
+MIN_CURRENT_DECIAMPS = 60
+MAX_CURRENT_DECIAMPS = 160
+
+# Input register addresses (function code 4)
+REGISTER_LAYOUT_VERSION = 4
+REGISTER_CHARGING_STATE = 5
+REGISTER_L1_RMS = 6
+REGISTER_L2_RMS = 7
+REGISTER_L3_RMS = 8
+REGISTER_PCB_TEMPERATURE = 9
+REGISTER_VOLTAGE_L1 = 10
+REGISTER_VOLTAGE_L2 = 11
+REGISTER_VOLTAGE_L3 = 12
+REGISTER_EXT_LOCK_STATE = 13
+REGISTER_POWER_OVERALL = 14
+# 32-bit counters; the high word is followed by the low word
+REGISTER_ENERGY_SINCE_POWER_ON = 15
+REGISTER_ENERGY_SINCE_INSTALLATION = 17
+
+# Holding register addresses (function code 3, written with function code 6)
+REGISTER_MODBUS_TIMEOUT = 257
+REGISTER_STANDBY_CONTROL = 258
+REGISTER_REMOTE_LOCK = 259
+REGISTER_MAX_CURRENT = 261
+REGISTER_FAILSAFE_CURRENT = 262
+
+# Register value -> decoded state for the boolean registers
+_EXT_LOCK_STATES = {0: True, 1: False}
+_STANDBY_CONTROL_STATES = {0: True, 4: False}
+_REMOTE_LOCK_STATES = {0: True, 1: False}
+
+
+def _decode_layout_version(value: int) -> str:
+    version = str(value)
+    if len(version) != 3:
+        raise ValueError(f"Unsupported Modbus register layout version: {version}")
+    return ".".join(version)
+
+
+def _decode_charging_state(value: int) -> WallboxChargingState:
+    state = (
+        WALLBOX_CHARGING_STATES[value] if value < len(WALLBOX_CHARGING_STATES) else None
+    )
+    if state is None:
+        raise ValueError(f"Unknown charging state: {value}")
+    return state
+
+
+def _decode_raw(value: int) -> int:
     return value
 
 
-class _PropIndexer(type):
-    def __new__(cls, name, bases, attrs, **kwargs):
-        cls = super().__new__(cls, name, bases, attrs, **kwargs)
-        own_props = {n: o for n, o in attrs.items() if isinstance(o, property)}
+def _decode_tenths(value: int) -> float:
+    return value / 10.0
 
-        cls.OWN_GETTERS = tuple(n for n, p in own_props.items() if p.fget is not None)
-        cls.OWN_SETTERS = tuple(
-            n for n, p in own_props.items() if p.fget and p.fset is not None
-        )
 
-        return cls
+def _decode_pcb_temperature(value: int) -> float:
+    # The value is in two's complement format; flipping the sign bit and
+    # subtracting it again sign-extends the 16-bit value without a branch.
+    return ((value ^ 0x8000) - 0x8000) / 10.0
+
+
+def _decode_ext_lock_state(value: int) -> bool:
+    state = _EXT_LOCK_STATES.get(value)
+    if state is None:
+        raise ValueError(f"Unknown external lock state: {value}")
+    return state
+
+
+def _decode_uint32(high: int, low: int) -> int:
+    return (high << 16) + low
+
+
+def _decode_standby_control(value: int) -> bool:
+    state = _STANDBY_CONTROL_STATES.get(value)
+    if state is None:
+        raise ValueError(f"Unknown standby control state: {value}")
+    return state
+
+
+def _decode_remote_lock(value: int) -> bool:
+    state = _REMOTE_LOCK_STATES.get(value)
+    if state is None:
+        raise ValueError(f"Unknown remote lock state: {value}")
+    return state
+
+
+def _decode_failsafe_current(value: int) -> float:
+    if MIN_CURRENT_DECIAMPS <= value <= MAX_CURRENT_DECIAMPS or value == 0:
+        return value / 10.0
+    else:
+        raise ValueError(f"Invalid failsafe current: {value}")
+
+
+# Property name -> (first register, register count, function code, decoder).
+# The decoder receives the raw register values in address order.
+_REGISTER_MAP: dict[str, tuple[int, int, ModbusFunctionCode, Callable[..., Any]]] = {
+    "modbus_register_layout_version": (
+        REGISTER_LAYOUT_VERSION,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_layout_version,
+    ),
+    "charging_state": (
+        REGISTER_CHARGING_STATE,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_charging_state,
+    ),
+    "L1_rms": (
+        REGISTER_L1_RMS,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_tenths,
+    ),
+    "L2_rms": (
+        REGISTER_L2_RMS,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_tenths,
+    ),
+    "L3_rms": (
+        REGISTER_L3_RMS,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_tenths,
+    ),
+    "pcb_temperature": (
+        REGISTER_PCB_TEMPERATURE,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_pcb_temperature,
+    ),
+    "voltage_L1": (
+        REGISTER_VOLTAGE_L1,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_raw,
+    ),
+    "voltage_L2": (
+        REGISTER_VOLTAGE_L2,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_raw,
+    ),
+    "voltage_L3": (
+        REGISTER_VOLTAGE_L3,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_raw,
+    ),
+    "ext_lock_state": (
+        REGISTER_EXT_LOCK_STATE,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_ext_lock_state,
+    ),
+    "power_overall": (
+        REGISTER_POWER_OVERALL,
+        1,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_raw,
+    ),
+    "energy_since_power_on": (
+        REGISTER_ENERGY_SINCE_POWER_ON,
+        2,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_uint32,
+    ),
+    "energy_since_installation": (
+        REGISTER_ENERGY_SINCE_INSTALLATION,
+        2,
+        ModbusFunctionCode.READ_INPUT_REGISTER,
+        _decode_uint32,
+    ),
+    "modbus_timeout": (
+        REGISTER_MODBUS_TIMEOUT,
+        1,
+        ModbusFunctionCode.READ_HOLDING_REGISTER,
+        _decode_raw,
+    ),
+    "standby_control": (
+        REGISTER_STANDBY_CONTROL,
+        1,
+        ModbusFunctionCode.READ_HOLDING_REGISTER,
+        _decode_standby_control,
+    ),
+    "remote_lock": (
+        REGISTER_REMOTE_LOCK,
+        1,
+        ModbusFunctionCode.READ_HOLDING_REGISTER,
+        _decode_remote_lock,
+    ),
+    "max_current": (
+        REGISTER_MAX_CURRENT,
+        1,
+        ModbusFunctionCode.READ_HOLDING_REGISTER,
+        _decode_tenths,
+    ),
+    "failsafe_current": (
+        REGISTER_FAILSAFE_CURRENT,
+        1,
+        ModbusFunctionCode.READ_HOLDING_REGISTER,
+        _decode_failsafe_current,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class _RegisterBlock:
+    function_code: ModbusFunctionCode
+    start: int
+    count: int
+    names: tuple[str, ...]
+
+
+def _plan_register_blocks(names: Iterable[str]) -> tuple[_RegisterBlock, ...]:
+    """Group properties into runs of adjacent registers that can be read at once."""
+    fields = sorted(
+        (_REGISTER_MAP[name][2], _REGISTER_MAP[name][0], name) for name in names
+    )
+    blocks: list[_RegisterBlock] = []
+    for _, address, name in fields:
+        _, count, function_code, _ = _REGISTER_MAP[name]
+        if blocks:
+            last = blocks[-1]
+            if (
+                last.function_code is function_code
+                and last.start + last.count == address
+                and last.count + count <= MAX_REGISTERS_PER_READ
+            ):
+                blocks[-1] = _RegisterBlock(
+                    function_code, last.start, last.count + count, (*last.names, name)
+                )
+                continue
+        blocks.append(_RegisterBlock(function_code, address, count, (name,)))
+    return tuple(blocks)
+
+
+_REGISTER_BLOCKS = _plan_register_blocks(_REGISTER_MAP)
+
+# Seconds between background polls per property; None means read once.
+# Registers 5-14 share an interval so they are still fetched in one request.
+POLL_SCHEDULE: dict[str, float | None] = {
+    "modbus_register_layout_version": None,
+    "charging_state": 1.0,
+    "L1_rms": 1.0,
+    "L2_rms": 1.0,
+    "L3_rms": 1.0,
+    "pcb_temperature": 1.0,
+    "voltage_L1": 1.0,
+    "voltage_L2": 1.0,
+    "voltage_L3": 1.0,
+    "ext_lock_state": 1.0,
+    "power_overall": 1.0,
+    "energy_since_power_on": 10.0,
+    "energy_since_installation": 60.0,
+    # Holding registers only change when written
+    "modbus_timeout": 60.0,
+    "standby_control": 60.0,
+    "remote_lock": 60.0,
+    "max_current": 60.0,
+    "failsafe_current": 60.0,
+}
+
+
+def _encode_current(value: float, label: str) -> int:
+    """Convert Amperes to the tenths the current registers hold, checking the range."""
+    int_value = int(value * 10)
+    if int_value != 0 and not (
+        MIN_CURRENT_DECIAMPS <= int_value <= MAX_CURRENT_DECIAMPS
+    ):
+        raise ValueError(f"Invalid {label}: {value}")
+    return int_value
+
+
+def fit_uint16(value: int) -> int:
+    return 0 if value < 0 else 65_535 if value > 65_535 else value
+
 
+def _collect_properties(cls: type["Wallbox"]) -> None:
+    """Record the names of the properties defined directly on cls."""
+    own_props = {n: o for n, o in vars(cls).items() if isinstance(o, property)}
 
-class Wallbox(WallboxInstrument, metaclass=_PropIndexer):
+    cls.OWN_GETTERS = tuple(n for n, p in own_props.items() if p.fget is not None)
+    cls.OWN_SETTERS = tuple(
+        n for n, p in own_props.items() if p.fget and p.fset is not None
+    )
+
+
+class Wallbox(WallboxInstrument):
     OWN_GETTERS: ClassVar[tuple[str, ...]]
     OWN_SETTERS: ClassVar[tuple[str, ...]]
+    REGISTER_TTL: ClassVar[dict[tuple[int, int], float]] = {
+        # The register layout version is fixed by the firmware
+        (ModbusFunctionCode.READ_INPUT_REGISTER, REGISTER_LAYOUT_VERSION): math.inf,
+    }
 
-    def __init__(self, serial_port, slave_address):
-        super().__init__(serial_port, slave_address)
-        # Keepalive command is modbus_register_layout_version
-        self.keepalive_command = "modbus_register_layout_version"
+    def keepalive(self) -> str:
+        """
+        Send a keepalive by reading the Modbus register layout version.
+
+        The read always goes to the wallbox, bypassing the read cache.
+        """
+        return _decode_layout_version(
+            self._read_register(
+                REGISTER_LAYOUT_VERSION,
+                ModbusFunctionCode.READ_INPUT_REGISTER,
+                use_cache=False,
+            )
+        )
+
+    def _read_input_register(self, register_address: int) -> int:
+        """Read a single input register (function code 4)."""
+        return self._read_register(
+            register_address, ModbusFunctionCode.READ_INPUT_REGISTER
+        )
+
+    def _read_holding_register(self, register_address: int) -> int:
+        """Read a single holding register (function code 3)."""
+        return self._read_register(
+            register_address, ModbusFunctionCode.READ_HOLDING_REGISTER
+        )
+
+    def snapshot(self, names: Iterable[str] | None = None) -> dict[str, Any]:
+        """
+        Read properties using one Modbus request per block of adjacent registers.
+
+        Args:
+            names: Properties to read; all properties if None
+
+        Returns:
+            Mapping of property name to decoded value. Properties that could not
+            be read or decoded map to the raised exception instead.
+        """
+        blocks = _REGISTER_BLOCKS if names is None else _plan_register_blocks(names)
+        values: dict[str, Any] = {}
+        for block in blocks:
+            try:
+                registers = self._read_registers(
+                    block.start, block.count, block.function_code
+                )
+            except Exception as exc:
+                if len(block.names) > 1 and isinstance(
+                    exc.__cause__, minimalmodbus.SlaveReportedException
+                ):
+                    # The wallbox rejected the block; fall back to one read per field
+                    for name in block.names:
+                        values[name] = self._read_field(name)
+                else:
+                    for name in block.names:
+                        values[name] = exc
+                continue
+
+            for name in block.names:
+                address, count, _, decode = _REGISTER_MAP[name]
+                offset = address - block.start
+                try:
+                    values[name] = decode(*registers[offset : offset + count])
+                except Exception as exc:
+                    values[name] = exc
+        return {name: values[name] for name in self.OWN_GETTERS if name in values}
+
+    def _read_field(self, name: str) -> Any:
+        """Read and decode a single property, returning the exception on failure."""
+        address, count, function_code, decode = _REGISTER_MAP[name]
+        try:
+            return decode(*self._read_registers(address, count, function_code))
+        except Exception as exc:
+            return exc
 
     @property
     def modbus_register_layout_version(self) -> str:
         """Get the Modbus register layout version"""
-        value = str(self._read_register(4, ModbusFunctionCode.READ_INPUT_REGISTER))
-        if len(value) != 3:
-            raise ValueError(f"Unsupported Modbus register layout version: {value}")
-        return ".".join(value)
+        return _decode_layout_version(
+            self._read_input_register(REGISTER_LAYOUT_VERSION)
+        )
 
     @property
     def charging_state(self) -> WallboxChargingState:
         """Get the current charging state"""
-        value = self._read_register(5, ModbusFunctionCode.READ_INPUT_REGISTER)
-        if value not in WALLBOX_CHARGING_STATES:
-            raise ValueError(f"Unknown charging state: {value}")
-        return WALLBOX_CHARGING_STATES[value]
+        return _decode_charging_state(
+            self._read_input_register(REGISTER_CHARGING_STATE)
+        )
 
     @property
     def L1_rms(self) -> float:
         """Get the RMS voltage of L1"""
-        return self._read_register(6, ModbusFunctionCode.READ_INPUT_REGISTER) / 10.0
+        return self._read_input_register(REGISTER_L1_RMS) / 10.0
 
     @property
     def L2_rms(self) -> float:
         """Get the RMS voltage of L2"""
-        return self._read_register(7, ModbusFunctionCode.READ_INPUT_REGISTER) / 10.0
+        return self._read_input_register(REGISTER_L2_RMS) / 10.0
 
     @property
     def L3_rms(self) -> float:
         """Get the RMS voltage of L3"""
-        return self._read_register(8, ModbusFunctionCode.READ_INPUT_REGISTER) / 10.0
+        return self._read_input_register(REGISTER_L3_RMS) / 10.0
 
     @property
     def pcb_temperature(self) -> float:
         """Get the PCB temperature"""
-        value = self._read_register(9, ModbusFunctionCode.READ_INPUT_REGISTER)
-        # The value is in two's complement format. We convert to a normal integer.
-        if value >= 0x8000:
-            value -= 0x10000
-        return value / 10.0
+        return _decode_pcb_temperature(
+            self._read_input_register(REGISTER_PCB_TEMPERATURE)
+        )
 
     @property
     def voltage_L1(self) -> float:
         """Get the voltage of L1"""
-        return self._read_register(10, ModbusFunctionCode.READ_INPUT_REGISTER)
+        return self._read_input_register(REGISTER_VOLTAGE_L1)
 
     @property
     def voltage_L2(self) -> float:
         """Get the voltage of L2"""
-        return self._read_register(11, ModbusFunctionCode.READ_INPUT_REGISTER)
+        return self._read_input_register(REGISTER_VOLTAGE_L2)
 
     @property
     def voltage_L3(self) -> float:
         """Get the voltage of L3"""
-        return self._read_register(12, ModbusFunctionCode.READ_INPUT_REGISTER)
+        return self._read_input_register(REGISTER_VOLTAGE_L3)
 
     @property
     def ext_lock_state(self) -> bool:
         """Get the external lock state
         True if the external lock is engaged, False otherwise
         """
-        value = self._read_register(13, ModbusFunctionCode.READ_INPUT_REGISTER)
-        if value not in (0, 1):
-            raise ValueError(f"Unknown external lock state: {value}")
-        return not bool(value)
+        return _decode_ext_lock_state(
+            self._read_input_register(REGISTER_EXT_LOCK_STATE)
+        )
 
     @property
     def power_overall(self) -> int:
         """Get the overall power"""
-        return self._read_register(14, ModbusFunctionCode.READ_INPUT_REGISTER)
+        return self._read_input_register(REGISTER_POWER_OVERALL)
 
     @property
     def energy_since_power_on(self) -> int:
@@ -145,7 +492,9 @@ class Wallbox(WallboxInstrument, metaclass=_PropIndexer):
         - Low byte in register 16 (bits 15-0)
         """
         return self._read_32bit_from_registers(
-            15, 16, ModbusFunctionCode.READ_INPUT_REGISTER
+            REGISTER_ENERGY_SINCE_POWER_ON,
+            REGISTER_ENERGY_SINCE_POWER_ON + 1,
+            ModbusFunctionCode.READ_INPUT_REGISTER,
         )
 
     @property
@@ -157,85 +506,78 @@ class Wallbox(WallboxInstrument, metaclass=_PropIndexer):
         - Low byte in register 18 (bits 15-0)
         """
         return self._read_32bit_from_registers(
-            17, 18, ModbusFunctionCode.READ_INPUT_REGISTER
+            REGISTER_ENERGY_SINCE_INSTALLATION,
+            REGISTER_ENERGY_SINCE_INSTALLATION + 1,
+            ModbusFunctionCode.READ_INPUT_REGISTER,
         )
 
     @property
     def modbus_timeout(self) -> int:
         """Get the Modbus timeout in milliseconds"""
-        return self._read_register(257, ModbusFunctionCode.READ_HOLDING_REGISTER)
+        return self._read_holding_register(REGISTER_MODBUS_TIMEOUT)
 
     @modbus_timeout.setter
     def modbus_timeout(self, value: int) -> bool:
         """Set the Modbus timeout in milliseconds"""
-        return self._write_register(257, fit_uint16(value))
+        return self._write_register(REGISTER_MODBUS_TIMEOUT, fit_uint16(value))
 
     @property
     def standby_control(self) -> bool:
         """Get the standby control state
         True if standby control is enabled, False otherwise
         """
-        value = self._read_register(258, ModbusFunctionCode.READ_HOLDING_REGISTER)
-        if value == 0:
-            return True
-        elif value == 4:
-            return False
-        else:
-            raise ValueError(f"Unknown standby control state: {value}")
+        return _decode_standby_control(
+            self._read_holding_register(REGISTER_STANDBY_CONTROL)
+        )
 
     @standby_control.setter
     def standby_control(self, value: bool) -> bool:
         """Set the standby control state
         True to enable standby control, False to disable
         """
-        return self._write_register(258, 0 if value else 4)
+        return self._write_register(REGISTER_STANDBY_CONTROL, 0 if value else 4)
 
     @property
     def remote_lock(self) -> bool:
         """Get the remote lock state
         True if locked, False if unlocked
         """
-        value = self._read_register(259, ModbusFunctionCode.READ_HOLDING_REGISTER)
-        if value in (0, 1):
-            return not bool(value)
-        else:
-            raise ValueError(f"Unknown remote lock state: {value}")
+        return _decode_remote_lock(self._read_holding_register(REGISTER_REMOTE_LOCK))
 
     @remote_lock.setter
     def remote_lock(self, value: bool) -> bool:
         """Set the remote lock state
         True to lock, False to unlock
         """
-        return self._write_register(259, 0 if value else 1)
+        return self._write_register(REGISTER_REMOTE_LOCK, 0 if value else 1)
 
     @property
     def max_current(self) -> float:
         """Get the maximum current in Amperes"""
-        return self._read_register(261, ModbusFunctionCode.READ_HOLDING_REGISTER) / 10.0
+        return self._read_holding_register(REGISTER_MAX_CURRENT) / 10.0
 
     @max_current.setter
     def max_current(self, value: float) -> bool:
         """Set the maximum current in Amperes"""
-        int_value = int(value * 10)
-        if int_value != 0 and (int_value < 60 or int_value > 160):
-            raise ValueError(f"Invalid max current: {value}")
-        return self._write_register(261, fit_uint16(int_value))
+        return self._write_register(
+            REGISTER_MAX_CURRENT, _encode_current(value, "max current")
+        )
 
     @property
     def failsafe_current(self) -> float:
         """Get the failsafe current in Amperes"""
-        value = self._read_register(262, ModbusFunctionCode.READ_HOLDING_REGISTER)
-        if (value >= 60 and value <= 160) or value == 0:
-            return value / 10.0
-        else:
-            raise ValueError(f"Invalid failsafe current: {value}")
+        return _decode_failsafe_current(
+            self._read_holding_register(REGISTER_FAILSAFE_CURRENT)
+        )
 
     @failsafe_current.setter
     def failsafe_current(self, value: float) -> bool:
         """Set the failsafe current in Amperes
         Set to 0 to disable failsafe current
         """
-        int_value = int(value * 10)
-        if (int_value < 60 or int_value > 160) and int_value != 0:
-            raise ValueError(f"Invalid failsafe current: {value}")
-        return self._write_register(262, fit_uint16(int_value))
+        return self._write_register(
+            REGISTER_FAILSAFE_CURRENT, _encode_current(value, "failsafe current")
+        )
+
+
+_collect_properties(Wallbox)
@@ -1,10 +1,13 @@
+import hashlib
+import json
 import logging
 import threading
 from typing import Any
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, status
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
 
 from wallbox_control.main import WallboxController
 
@@ -12,7 +15,8 @@ from wallbox_control.main import WallboxController
 class MaxCurrentRequest(BaseModel):
     """Request model for setting maximum current."""
 
-    max_current: float
+    # 63A is the typical maximum for most wallboxes; the wallbox may be stricter
+    max_current: float = Field(ge=0.0, le=63.0)
 
     class Config:
         json_schema_extra = {"example": {"max_current": 16.0}}
@@ -50,7 +54,12 @@ class WebServerController:
             version="1.0.0",
         )
         self._server_thread: threading.Thread | None = None
+        self._uvicorn_server: uvicorn.Server | None = None
+        # (encoded status, JSON body, ETag) of the last /status response
+        self._status_cache: tuple[Any, bytes, str] | None = None
         self._running = False
+        # Set when the server stops, whether through stop() or by exiting
+        self._stop_event = threading.Event()
 
         # Configure logging
         self.logger = logging.getLogger(__name__)
@@ -62,23 +71,41 @@ class WebServerController:
         """Setup FastAPI routes."""
 
         @self.app.get("/status", response_model=dict[str, Any])
-        async def get_wallbox_status():
+        def get_wallbox_status(request: Request):
             """
             Get all current wallbox settings and status information.
 
             Returns a dictionary containing all readable wallbox properties
             including voltages, currents, charging state, temperatures, etc.
+            Responses carry an ETag; a request with a matching If-None-Match
+            gets 304 Not Modified. X-Snapshot-Age gives the age of the values
+            in seconds.
             """
             try:
-                return self.wallbox_controller.get_all_properties()
+                result = self.wallbox_controller.get_all_properties()
             except Exception as e:
                 self.logger.exception("Failed to get wallbox status")
                 raise HTTPException(
                     status_code=500, detail=f"Failed to get wallbox status: {str(e)}"
                 ) from e
 
+            age = result.pop("snapshot_age", None)
+            body, etag = self._encode_status(result)
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if age is not None:
+                headers["X-Snapshot-Age"] = f"{age:.3f}"
+
+            # Weak comparison, as proxies and compression may mark tags W/
+            if_none_match = request.headers.get("if-none-match", "")
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+            return Response(body, media_type="application/json", headers=headers)
+
         @self.app.post("/max_current")
-        async def set_max_current(request: MaxCurrentRequest):
+        def set_max_current(request: MaxCurrentRequest):
             """
             Set the maximum charging current for the wallbox.
 
@@ -89,18 +116,6 @@ class WebServerController:
                 Success message with the set current value
             """
             try:
-                # Validate current range (basic validation, wallbox may have its own limits)
-                if request.max_current < 0:
-                    raise HTTPException(
-                        status_code=400, detail="Maximum current cannot be negative"
-                    )
-
-                if request.max_current > 63:  # Typical maximum for most wallboxes
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Maximum current exceeds safe limit (63A)",
-                    )
-
                 decision = self.wallbox_controller.request_manual_max_current(
                     request.max_current
                 )
@@ -110,7 +125,8 @@ class WebServerController:
                     "applied_current": decision.applied_current,
                     "origin": decision.origin,
                     "overridden": decision.overridden,
-                    "limit_debug": decision.snapshots,
+                    # Plain dicts, so error details can be serialized too
+                    "limit_debug": jsonable_encoder(decision.snapshots),
                 }
 
                 if decision.applied_current is None:
@@ -168,6 +184,18 @@ class WebServerController:
                 },
             }
 
+    def _encode_status(self, result: dict[str, Any]) -> tuple[bytes, str]:
+        """Serialize a status result, reusing the last body while it is unchanged."""
+        content = jsonable_encoder(result)
+        cached = self._status_cache
+        if cached is not None and cached[0] == content:
+            return cached[1], cached[2]
+
+        body = json.dumps(content, separators=(",", ":")).encode()
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        self._status_cache = (content, body, etag)
+        return body, etag
+
     def start(self):
         """Start the web server in a background thread."""
         if self._running:
@@ -175,21 +203,27 @@ class WebServerController:
             return
 
         self._running = True
+        self._stop_event.clear()
+        server = uvicorn.Server(
+            uvicorn.Config(
+                self.app,
+                host=self.host,
+                port=self.port,
+                log_level="info",
+                access_log=True,
+            )
+        )
+        self._uvicorn_server = server
 
         def run_server():
             """Run the uvicorn server."""
             try:
-                uvicorn.run(
-                    self.app,
-                    host=self.host,
-                    port=self.port,
-                    log_level="info",
-                    access_log=True,
-                )
+                server.run()
             except Exception:
                 self.logger.exception("Web server failed")
             finally:
                 self._running = False
+                self._stop_event.set()
 
         self._server_thread = threading.Thread(
             target=run_server, daemon=True, name="WebServer"
@@ -207,13 +241,15 @@ class WebServerController:
             return
 
         self._running = False
+        self._stop_event.set()
 
-        # Note: uvicorn doesn't have a clean way to stop from another thread
-        # In a production environment, you'd want to use uvicorn's programmatic API
-        # or implement a proper shutdown mechanism
+        # uvicorn checks should_exit on its event loop and shuts down gracefully
+        if self._uvicorn_server is not None:
+            self._uvicorn_server.should_exit = True
 
         if self._server_thread and self._server_thread.is_alive():
             self.logger.info("Web server stop requested")
+            self._server_thread.join(timeout=5.0)
 
     def __enter__(self):
         """Context manager entry."""
@@ -244,10 +280,9 @@ def web_server_worker(
         server = WebServerController(wallbox_controller, host, port)
         server.start()
 
-        # Keep the thread alive
+        # Keep the thread alive until the server stops
         try:
-            while server._running:
-                threading.Event().wait(1.0)
+            server._stop_event.wait()
         except KeyboardInterrupt:
             logger.info("Web server worker received shutdown signal")
             server.stop()
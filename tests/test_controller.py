@@ -1,22 +1,43 @@
 from __future__ import annotations
 
+import logging
+import threading
+import time
 from dataclasses import dataclass
 from unittest.mock import MagicMock
 
 import pytest
 
-from wallbox_control.limits import LimitDecision, LimitSource
-from wallbox_control.main import WallboxController, gpio_worker
+from wallbox_control.limits import LimitSource
+from wallbox_control.main import (
+    GPIO_BOUNCE_TIME,
+    WallboxController,
+    _prioritize_current_thread,
+    gpio_worker,
+)
 
 
 @dataclass
 class _RecordedWallbox:
     OWN_GETTERS: tuple[str, ...] = ("max_current",)
     OWN_SETTERS: tuple[str, ...] = ("max_current",)
+    last_transaction_time = 0.0
 
     def __post_init__(self) -> None:
         self.max_current_calls: list[float] = []
         self._max_current: float | None = None
+        self.keepalive_reads = 0
+        self.snapshot_reads = 0
+        self.snapshot_names: list = []
+
+    def keepalive(self) -> str:
+        self.keepalive_reads += 1
+        return "1.0.0"
+
+    def snapshot(self, names=None) -> dict:
+        self.snapshot_reads += 1
+        self.snapshot_names.append(names)
+        return {"max_current": self._max_current}
 
     @property
     def max_current(self) -> float | None:
@@ -75,48 +96,337 @@ def test_repeated_manual_request_avoids_duplicate_write(fake_wallbox_factory):
     assert wallbox.max_current_calls == [16.0]
 
 
+def _dummy_button_class(buttons: list) -> type:
+    class DummyButton:
+        def __init__(
+            self,
+            label: str,
+            pull_up: bool = False,
+            bounce_time: float | None = None,  # noqa: FBT001, FBT002
+        ) -> None:
+            self.label = label
+            self.bounce_time = bounce_time
+            self.is_pressed = False
+            self.when_pressed = None
+            self.when_released = None
+            self.closed = False
+            buttons.append(self)
+
+        def close(self) -> None:
+            self.closed = True
+
+    return DummyButton
+
+
 def test_gpio_worker_reacts_to_state_changes(monkeypatch):
-    sequences = {
-        "GPIO6": [False, True],
+    buttons: list = []
+    monkeypatch.setattr("wallbox_control.main.Button", _dummy_button_class(buttons))
+
+    controller = MagicMock()
+
+    stop = threading.Event()
+    worker = threading.Thread(target=gpio_worker, args=(controller, stop), daemon=True)
+    worker.start()
+    for _ in range(200):
+        if controller.submit_hardware_input.call_count:
+            break
+        time.sleep(0.005)
+
+    button = buttons[-1]
+    button.is_pressed = True
+    button.when_pressed()
+
+    stop.set()
+    worker.join(timeout=1.0)
+
+    assert not worker.is_alive()
+    assert button.closed is True
+    assert button.bounce_time == GPIO_BOUNCE_TIME
+    assert [c.args for c in controller.submit_hardware_input.call_args_list] == [
+        (False,),
+        (True,),
+    ]
+
+
+def test_submitted_hardware_inputs_collapse_to_latest(fake_wallbox_factory):
+    controller = WallboxController("/dev/null", 1)
+    wallbox = fake_wallbox_factory[-1]
+
+    # Edges arriving before the worker runs only leave the latest state
+    controller.submit_hardware_input(False)
+    controller.submit_hardware_input(True)
+    controller.start()
+    try:
+        for _ in range(200):
+            if wallbox.max_current_calls:
+                break
+            time.sleep(0.005)
+    finally:
+        controller.stop()
+
+    assert wallbox.max_current_calls == [6.0]
+
+
+def test_finalizer_stops_workers_without_stop_call(fake_wallbox_factory):
+    controller = WallboxController("/dev/null", 1)
+    controller.start()
+    worker = controller._hardware_input_thread
+
+    controller._finalizer()
+    worker.join(timeout=1.0)
+
+    assert not worker.is_alive()
+
+
+def test_keepalive_only_sent_when_bus_is_idle(fake_wallbox_factory):
+    idle = WallboxController("/dev/null", 1, keepalive_interval=5.0)
+    busy = WallboxController("/dev/null", 1, keepalive_interval=5.0)
+    idle_wallbox, busy_wallbox = fake_wallbox_factory
+    busy_wallbox.last_transaction_time = time.monotonic()
+
+    for controller in (idle, busy):
+        controller.start()
+    for _ in range(200):
+        if idle_wallbox.keepalive_reads:
+            break
+        time.sleep(0.005)
+    for controller in (idle, busy):
+        controller.stop()
+
+    assert idle_wallbox.keepalive_reads == 1
+    assert busy_wallbox.keepalive_reads == 0
+
+
+def test_generic_property_access_uses_wallbox_properties(fake_wallbox_factory):
+    controller = WallboxController("/dev/null", 1)
+    wallbox = fake_wallbox_factory[-1]
+
+    assert controller.set_property("max_current", 10.0) is True
+    assert controller.get_property("max_current") == 10.0
+    assert wallbox.max_current_calls == [10.0]
+
+    with pytest.raises(AttributeError, match="not a readable property"):
+        controller.get_property("missing")
+    with pytest.raises(AttributeError, match="not a writable property"):
+        controller.set_property("missing", 1)
+
+
+def test_unchanged_hardware_input_skips_evaluation(fake_wallbox_factory, monkeypatch):
+    controller = WallboxController("/dev/null", 1)
+    first = controller.update_hardware_input(True)
+    evaluate = MagicMock(side_effect=controller._hardware_limiter.evaluate)
+    monkeypatch.setattr(controller._hardware_limiter, "evaluate", evaluate)
+
+    assert controller.update_hardware_input(True) is first
+    evaluate.assert_not_called()
+
+    controller.update_hardware_input(False)
+    evaluate.assert_called_once_with(False)
+
+
+def test_all_properties_come_from_published_status(fake_wallbox_factory):
+    controller = WallboxController("/dev/null", 1, poll_interval=60.0)
+    wallbox = fake_wallbox_factory[-1]
+    wallbox._max_current = 10.0
+
+    controller.start()
+    try:
+        for _ in range(200):
+            if wallbox.snapshot_reads:
+                break
+            time.sleep(0.005)
+        first = controller.get_all_properties()
+        second = controller.get_all_properties()
+    finally:
+        controller.stop()
+
+    assert wallbox.snapshot_reads == 1
+    assert first["max_current"] == second["max_current"] == 10.0
+    assert first["snapshot_age"] >= 0
+    assert "current_limit" in first
+
+
+def test_poll_rereads_properties_on_their_schedule(fake_wallbox_factory, monkeypatch):
+    monkeypatch.setattr(
+        "wallbox_control.main.POLL_SCHEDULE",
+        {"max_current": 10.0, "charging_state": None},
+    )
+    controller = WallboxController("/dev/null", 1)
+    controller.GETTERS = ("max_current", "charging_state", "power_overall")
+    controller._polled_at = {
+        "max_current": 100.0,
+        "charging_state": 0.0,
+        "power_overall": 100.0,
     }
 
-    class DummyButton:
-        def __init__(self, label: str, pull_up: bool = False) -> None:  # noqa: FBT001, FBT002
-            self._label = label
-            self._index = 0
+    # Unscheduled properties are due every tick, None means read once
+    assert controller._due_properties(105.0) == ["power_overall"]
+    assert controller._due_properties(110.0) == ["max_current", "power_overall"]
+
+    controller.set_property("max_current", 8.0)
+    assert "max_current" in controller._due_properties(101.0)
+
+
+def test_failed_write_is_retried_on_next_update(fake_wallbox_factory, monkeypatch):
+    controller = WallboxController("/dev/null", 1)
+    wallbox = fake_wallbox_factory[-1]
+    recording = _RecordedWallbox.max_current
+
+    def failing_setter(self, value):
+        raise RuntimeError("bus error")
+
+    monkeypatch.setattr(
+        _RecordedWallbox, "max_current", property(recording.fget, failing_setter)
+    )
+    failed = controller.update_hardware_input(True)
+    monkeypatch.setattr(_RecordedWallbox, "max_current", recording)
+
+    retried = controller.update_hardware_input(True)
+
+    assert failed.applied_current is None
+    assert retried.applied_current == 6.0
+    assert wallbox.max_current_calls == [6.0]
+
+
+def test_property_accessors_are_generated_for_wallbox_properties():
+    assert WallboxController.get_l1_rms.__name__ == "get_l1_rms"
+    assert callable(WallboxController.get_energy_since_installation)
+    assert callable(WallboxController.set_failsafe_current)
+    # Hand-written accessors with extra logic are kept
+    assert WallboxController.set_max_current.__doc__ == (
+        "Set the maximum current in Amperes (thread-safe)."
+    )
+
+
+def test_generated_accessors_use_wallbox_properties(fake_wallbox_factory):
+    controller = WallboxController("/dev/null", 1)
+    wallbox = fake_wallbox_factory[-1]
+    wallbox._max_current = 12.0
+
+    assert controller.get_max_current() == 12.0
+
+
+def test_write_during_poll_is_not_overwritten_by_publish(
+    fake_wallbox_factory, monkeypatch
+):
+    controller = WallboxController("/dev/null", 1)
+    wallbox = fake_wallbox_factory[-1]
+    controller._polled_at["max_current"] = 0.0
+    writer = threading.Thread(target=controller.set_property, args=("max_current", 8.0))
+    snapshot = wallbox.snapshot
+
+    def snapshot_then_write(names=None):
+        values = snapshot(names)
+        writer.start()
+        return values
 
-        @property
-        def is_pressed(self) -> bool:
-            values = sequences[self._label]
-            if self._index >= len(values):
-                return values[-1]
-            value = values[self._index]
-            self._index += 1
-            return value
+    real_monotonic = time.monotonic
 
-    monkeypatch.setattr("wallbox_control.main.Button", DummyButton)
+    def monotonic_after_write():
+        # Give the writer every chance to run before the poll stamps its values
+        writer.join(timeout=0.2)
+        return real_monotonic()
 
-    sleep_calls = {"count": 0}
+    wallbox.snapshot = snapshot_then_write
+    monkeypatch.setattr("wallbox_control.main.time.monotonic", monotonic_after_write)
+    controller._refresh_status(["max_current"])
+    monkeypatch.setattr("wallbox_control.main.time.monotonic", real_monotonic)
+    writer.join(timeout=1.0)
 
-    def fake_sleep(_duration: float) -> None:
-        sleep_calls["count"] += 1
-        if sleep_calls["count"] >= 3:
-            raise KeyboardInterrupt
+    assert wallbox.max_current_calls == [8.0]
+    assert "max_current" not in controller._polled_at
 
-    monkeypatch.setattr("wallbox_control.main.time.sleep", fake_sleep)
 
+def test_snapshot_age_reports_oldest_polled_value(fake_wallbox_factory, monkeypatch):
+    monkeypatch.setattr(
+        "wallbox_control.main.POLL_SCHEDULE",
+        {"max_current": 60.0, "charging_state": None},
+    )
+    clock = [1000.0]
+    monkeypatch.setattr("wallbox_control.main.time.monotonic", lambda: clock[0])
+    controller = WallboxController("/dev/null", 1)
+    controller._status = (
+        999.5,
+        {"max_current": 16.0, "charging_state": "A1", "power_overall": 0},
+        {"max_current": 950.0, "charging_state": 0.0, "power_overall": 999.5},
+    )
+
+    # The read-once charging_state is left out; max_current is the oldest
+    assert controller.get_all_properties()["snapshot_age"] == 50.0
+
+    controller._refresh_status(["max_current"])
+    clock[0] = 1000.5
+    assert controller.get_all_properties()["snapshot_age"] == 1.0
+    assert controller._status[2]["power_overall"] == 999.5
+
+
+def test_stale_status_is_served_while_poller_runs(fake_wallbox_factory):
+    controller = WallboxController("/dev/null", 1, poll_interval=60.0)
+    wallbox = fake_wallbox_factory[-1]
+
+    controller.start()
+    try:
+        for _ in range(200):
+            if controller._status is not None:
+                break
+            time.sleep(0.005)
+        # As if the poller had been stuck on a failing bus for a while
+        published_at = time.monotonic() - 300.0
+        controller._status = (
+            published_at,
+            {"max_current": 6.0},
+            {"max_current": published_at},
+        )
+
+        stale = controller.get_all_properties()
+        assert wallbox.snapshot_reads == 1
+    finally:
+        controller.stop()
+
+    assert stale["max_current"] == 6.0
+    assert stale["snapshot_age"] >= 300.0
+    # Without a poller the stale status is refreshed directly
+    assert controller.get_all_properties()["snapshot_age"] < 300.0
+    assert wallbox.snapshot_reads == 2
+
+
+def test_gpio_worker_resyncs_after_missed_edge(monkeypatch):
+    buttons: list = []
+    monkeypatch.setattr("wallbox_control.main.Button", _dummy_button_class(buttons))
+    monkeypatch.setattr("wallbox_control.main.GPIO_RESYNC_INTERVAL", 0.01)
     controller = MagicMock()
-    controller.update_hardware_input = MagicMock(
-        side_effect=[
-            LimitDecision(applied_current=None, origin=None, overridden=False, snapshots={}),
-            LimitDecision(
-                applied_current=6.0,
-                origin=LimitSource.HARDWARE_INPUT.value,
-                overridden=True,
-                snapshots={},
-            ),
-        ]
+
+    stop = threading.Event()
+    worker = threading.Thread(target=gpio_worker, args=(controller, stop), daemon=True)
+    worker.start()
+    for _ in range(200):
+        if controller.submit_hardware_input.call_count:
+            break
+        time.sleep(0.005)
+
+    # The input changes but its edge never reaches the callbacks
+    buttons[-1].is_pressed = True
+    for _ in range(200):
+        if controller.submit_hardware_input.call_args == ((True,),):
+            break
+        time.sleep(0.005)
+    stop.set()
+    worker.join(timeout=1.0)
+
+    assert not worker.is_alive()
+    controller.submit_hardware_input.assert_called_with(True)
+
+
+def test_thread_is_not_pinned_without_priority_boost(monkeypatch):
+    def refuse(*_args):
+        raise PermissionError("Operation not permitted")
+
+    pinned = []
+    monkeypatch.setattr("wallbox_control.main.os.sched_setscheduler", refuse)
+    monkeypatch.setattr(
+        "wallbox_control.main.os.sched_setaffinity", lambda *a: pinned.append(a)
     )
 
-    with pytest.raises(KeyboardInterrupt):
-        gpio_worker(controller)
+    _prioritize_current_thread(logging.getLogger("test"))
+
+    assert pinned == []
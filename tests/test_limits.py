@@ -1,3 +1,5 @@
+import dataclasses
+
 import pytest
 
 from wallbox_control.limits import (
@@ -143,3 +145,71 @@ def test_debug_snapshot_contains_latest_decision_state():
     assert snapshot["decision"]["applied_current"] == 10.0
     assert snapshot["decision"]["overridden"] is False
     assert snapshot["sources"][LimitSource.MANUAL_REQUEST.value]["current_amps"] == 10.0
+
+
+def test_snapshot_dict_is_built_once_and_shared():
+    manager = CurrentLimitManager()
+    manual = manager.request_manual(10.0)
+    hardware = manager.apply_override_snapshot(
+        HardwareInputLimiter("GPIO13").evaluate(True)
+    )
+
+    manual_dict = manual.snapshots[LimitSource.MANUAL_REQUEST.value]
+    assert hardware.snapshots[LimitSource.MANUAL_REQUEST.value] is manual_dict
+    assert manager.debug_snapshot()["sources"] is hardware.snapshots
+
+
+def test_hardware_limit_only_uses_hardware_origin():
+    manager = CurrentLimitManager()
+
+    decision = manager.apply_override_snapshot(
+        HardwareInputLimiter("GPIO13").evaluate(False)
+    )
+
+    assert decision.applied_current == 16.0
+    assert decision.origin == LimitSource.HARDWARE_INPUT.value
+    assert decision.overridden is False
+
+
+def test_unchanged_hardware_input_reuses_snapshot_and_decision():
+    manager = CurrentLimitManager()
+    limiter = HardwareInputLimiter("GPIO13")
+
+    first = manager.apply_override_snapshot(limiter.evaluate(True))
+    second = manager.apply_override_snapshot(limiter.evaluate(True))
+
+    assert limiter.evaluate(True) is limiter.evaluate(True)
+    assert second is first
+    assert manager.apply_override_snapshot(limiter.evaluate(False)) is not first
+
+
+def test_repeated_manual_request_reuses_decision():
+    manager = CurrentLimitManager()
+
+    first = manager.request_manual(16.0)
+
+    assert manager.request_manual(16.0) is first
+    assert manager.request_manual(10.0) is not first
+
+
+def test_shared_decision_cannot_be_modified():
+    manager = CurrentLimitManager()
+    decision = manager.request_manual(16.0)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        decision.applied_current = 6.0
+
+
+def test_decision_snapshots_are_read_only():
+    manager = CurrentLimitManager()
+    limiter = HardwareInputLimiter()
+    decision = manager.apply_override_snapshot(limiter.evaluate(True))
+    hardware = decision.snapshots[LimitSource.HARDWARE_INPUT.value]
+
+    with pytest.raises(TypeError):
+        decision.snapshots["injected"] = {}
+    with pytest.raises(TypeError):
+        hardware["current_amps"] = 32.0
+    with pytest.raises(TypeError):
+        hardware["details"]["inputs"]["GPIO6"] = False
+    assert manager.debug_snapshot()["sources"] is decision.snapshots
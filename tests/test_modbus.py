@@ -1,14 +1,26 @@
+import logging
 from unittest.mock import MagicMock
 
+import minimalmodbus
 import pytest
 
-from wallbox_control.modbus import ModbusFunctionCode, WallboxInstrument
+from wallbox_control.modbus import (
+    MAX_RECONNECT_ATTEMPTS,
+    ModbusFunctionCode,
+    WallboxInstrument,
+)
 
 
 def _make_instrument() -> WallboxInstrument:
     instrument = object.__new__(WallboxInstrument)
+    instrument.logger = logging.getLogger("test")
+    instrument.last_transaction_time = 0.0
+    instrument._reconnect_serial = MagicMock(return_value=False)
     instrument.read_register = MagicMock()
     instrument.write_register = MagicMock()
+    instrument._read_cache = {}
+    instrument._written_values = {}
+    instrument.read_cache_ttl = 0.1
     return instrument
 
 
@@ -19,7 +31,115 @@ def test_read_register_success():
     result = instrument._read_register(1, ModbusFunctionCode.READ_HOLDING_REGISTER)
 
     assert result == 42
-    instrument.read_register.assert_called_once_with(1, 0, ModbusFunctionCode.READ_HOLDING_REGISTER.value)
+    instrument.read_register.assert_called_once_with(
+        1, 0, ModbusFunctionCode.READ_HOLDING_REGISTER
+    )
+
+
+def test_read_register_serves_recent_values_from_cache():
+    instrument = _make_instrument()
+    instrument.read_register.return_value = 42
+
+    assert instrument._read_register(1, ModbusFunctionCode.READ_INPUT_REGISTER) == 42
+    assert instrument._read_register(1, ModbusFunctionCode.READ_INPUT_REGISTER) == 42
+    assert instrument.read_register.call_count == 1
+
+    instrument._read_register(
+        1, ModbusFunctionCode.READ_INPUT_REGISTER, use_cache=False
+    )
+    assert instrument.read_register.call_count == 2
+
+    instrument.invalidate_cache()
+    instrument._read_register(1, ModbusFunctionCode.READ_INPUT_REGISTER)
+    assert instrument.read_register.call_count == 3
+
+
+def test_holding_registers_are_cached_until_written(monkeypatch):
+    instrument = _make_instrument()
+    instrument.read_register.return_value = 10
+    instrument._read_register(8, ModbusFunctionCode.READ_HOLDING_REGISTER)
+
+    # Holding register values do not expire with the input register TTL
+    monkeypatch.setattr("wallbox_control.modbus.time.monotonic", lambda: 1e9)
+    assert instrument._read_register(8, ModbusFunctionCode.READ_HOLDING_REGISTER) == 10
+
+    instrument._write_register(8, 20)
+
+    assert instrument._read_register(8, ModbusFunctionCode.READ_HOLDING_REGISTER) == 20
+    assert instrument.read_register.call_count == 1
+
+
+def test_write_of_known_value_is_skipped():
+    instrument = _make_instrument()
+
+    assert instrument._write_register(8, 20) is True
+    assert instrument._write_register(8, 20) is True
+    instrument._write_register(8, 21)
+
+    assert [c.args[:2] for c in instrument.write_register.call_args_list] == [
+        (8, 20),
+        (8, 21),
+    ]
+
+
+def test_write_is_repeated_once_cached_value_expires():
+    instrument = _make_instrument()
+    instrument._write_register(8, 20)
+    # As if the cached value's TTL had passed
+    instrument._read_cache[(ModbusFunctionCode.READ_HOLDING_REGISTER, 8)] = (0.0, 20)
+    instrument._write_register(8, 20)
+    instrument.invalidate_cache()
+    instrument._write_register(8, 20)
+
+    assert instrument.write_register.call_count == 3
+
+
+def test_write_is_repeated_when_wallbox_changed_the_register():
+    instrument = _make_instrument()
+    instrument._write_register(8, 20)
+    # A poll finds the wallbox fell back to another value on its own
+    instrument.read_register.return_value = 10
+    instrument._read_register(
+        8, ModbusFunctionCode.READ_HOLDING_REGISTER, use_cache=False
+    )
+
+    instrument._write_register(8, 20)
+
+    assert instrument.write_register.call_count == 2
+
+
+def test_read_value_alone_does_not_skip_a_write():
+    instrument = _make_instrument()
+    instrument.read_register.return_value = 20
+    instrument._read_register(8, ModbusFunctionCode.READ_HOLDING_REGISTER)
+
+    instrument._write_register(8, 20)
+
+    instrument.write_register.assert_called_once()
+
+
+def test_written_value_follows_register_ttl(monkeypatch):
+    instrument = _make_instrument()
+    key = (ModbusFunctionCode.READ_HOLDING_REGISTER, 8)
+    monkeypatch.setattr(instrument, "REGISTER_TTL", {key: 5.0})
+    monkeypatch.setattr("wallbox_control.modbus.time.monotonic", lambda: 100.0)
+
+    instrument._write_register(8, 20)
+
+    assert instrument._read_cache[key] == (105.0, 20)
+
+
+def test_failed_write_drops_cached_value():
+    instrument = _make_instrument()
+    instrument.read_register.return_value = 10
+    instrument._read_register(8, ModbusFunctionCode.READ_HOLDING_REGISTER)
+    instrument.write_register.side_effect = ValueError("rejected")
+
+    with pytest.raises(RuntimeError):
+        instrument._write_register(8, 20)
+
+    instrument._read_register(8, ModbusFunctionCode.READ_HOLDING_REGISTER)
+    assert instrument.read_register.call_count == 2
 
 
 def test_read_register_wraps_exception():
@@ -30,6 +150,50 @@ def test_read_register_wraps_exception():
         instrument._read_register(1, ModbusFunctionCode.READ_INPUT_REGISTER)
 
 
+def test_read_registers_reads_block_in_one_request():
+    instrument = _make_instrument()
+    instrument.read_registers = MagicMock(return_value=[1, 2, 3])
+
+    result = instrument._read_registers(4, 3, ModbusFunctionCode.READ_INPUT_REGISTER)
+
+    assert result == [1, 2, 3]
+    instrument.read_registers.assert_called_once_with(
+        4, 3, ModbusFunctionCode.READ_INPUT_REGISTER
+    )
+
+
+def test_read_registers_fills_read_cache():
+    instrument = _make_instrument()
+    instrument.read_registers = MagicMock(return_value=[1, 2, 3])
+
+    instrument._read_registers(4, 3, ModbusFunctionCode.READ_INPUT_REGISTER)
+
+    assert instrument._read_register(6, ModbusFunctionCode.READ_INPUT_REGISTER) == 3
+    assert (
+        instrument._read_32bit_from_registers(
+            4, 5, ModbusFunctionCode.READ_INPUT_REGISTER
+        )
+        == (1 << 16) + 2
+    )
+    instrument.read_register.assert_not_called()
+    instrument.read_registers.assert_called_once()
+
+
+def test_read_32bit_combines_adjacent_registers_in_one_request():
+    instrument = _make_instrument()
+    instrument.read_registers = MagicMock(return_value=[0x0001, 0xE240])
+
+    result = instrument._read_32bit_from_registers(
+        15, 16, ModbusFunctionCode.READ_INPUT_REGISTER
+    )
+
+    assert result == 123456
+    instrument.read_registers.assert_called_once_with(
+        15, 2, ModbusFunctionCode.READ_INPUT_REGISTER
+    )
+    instrument.read_register.assert_not_called()
+
+
 def test_write_register_roundtrip_success():
     instrument = _make_instrument()
     instrument.read_register.return_value = 10
@@ -38,6 +202,18 @@ def test_write_register_roundtrip_success():
 
     assert succeeded is True
     instrument.write_register.assert_called_once_with(8, 10, 0, 6)
+    instrument.read_register.assert_not_called()
+
+
+def test_write_register_verify_reads_back():
+    instrument = _make_instrument()
+    instrument.read_register.return_value = 9
+
+    with pytest.raises(RuntimeError, match="Verification mismatch"):
+        instrument._write_register(8, 10, verify=True)
+    instrument.read_register.assert_called_once_with(
+        8, 0, ModbusFunctionCode.READ_HOLDING_REGISTER
+    )
 
 
 def test_write_register_wraps_exception():
@@ -47,3 +223,34 @@ def test_write_register_wraps_exception():
     with pytest.raises(RuntimeError, match="Failed to write value 5 to register 8"):
         instrument._write_register(8, 5)
 
+
+def test_serial_errors_reconnect_and_retry():
+    instrument = _make_instrument()
+    instrument._reconnect_serial.return_value = True
+    instrument.read_register.side_effect = [OSError("port gone"), 7]
+
+    assert instrument._read_register(1, ModbusFunctionCode.READ_INPUT_REGISTER) == 7
+    instrument._reconnect_serial.assert_called_once()
+
+
+def test_serial_errors_give_up_after_max_attempts():
+    instrument = _make_instrument()
+    instrument._reconnect_serial.return_value = True
+    instrument.read_register.side_effect = OSError("port gone")
+
+    with pytest.raises(RuntimeError, match="Failed to read register 1"):
+        instrument._read_register(1, ModbusFunctionCode.READ_INPUT_REGISTER)
+    assert instrument.read_register.call_count == MAX_RECONNECT_ATTEMPTS
+
+
+def test_slave_reported_errors_do_not_reconnect():
+    instrument = _make_instrument()
+    instrument.read_registers = MagicMock(
+        side_effect=minimalmodbus.IllegalRequestError("bad address")
+    )
+
+    with pytest.raises(RuntimeError) as excinfo:
+        instrument._read_registers(4, 3, ModbusFunctionCode.READ_INPUT_REGISTER)
+
+    assert isinstance(excinfo.value.__cause__, minimalmodbus.SlaveReportedException)
+    instrument._reconnect_serial.assert_not_called()
@@ -1,142 +1,378 @@
-from unittest.mock import MagicMock
+import logging
+from collections.abc import Callable
 
+import minimalmodbus
 import pytest
 
 from wallbox_control.wallbox import (
+    _REGISTER_MAP,
     WALLBOX_CHARGING_STATES,
     ModbusFunctionCode,
     Wallbox,
 )
 
 
+class FakeRegisters:
+    """Stands in for the Modbus helpers of a Wallbox and records every call."""
+
+    def __init__(self) -> None:
+        self.value = 0
+        self.value_32bit = 0
+        self.blocks: Callable[[int, int, int], list[int]] = lambda start, count, fc: (
+            [0] * count
+        )
+        self.reads: list[tuple[int, int, bool]] = []
+        self.reads_32bit: list[tuple[int, int, int]] = []
+        self.block_reads: list[tuple[int, int, int]] = []
+        self.writes: list[tuple[int, int]] = []
+
+    def read_register(
+        self, address: int, function_code: int, use_cache: bool = True
+    ) -> int:
+        self.reads.append((address, function_code, use_cache))
+        return self.value
+
+    def read_32bit(self, high: int, low: int, function_code: int) -> int:
+        self.reads_32bit.append((high, low, function_code))
+        return self.value_32bit
+
+    def read_registers(self, start: int, count: int, function_code: int) -> list[int]:
+        self.block_reads.append((start, count, function_code))
+        return self.blocks(start, count, function_code)
+
+    def write_register(self, address: int, value: int) -> bool:
+        self.writes.append((address, value))
+        return True
+
+
 @pytest.fixture()
-def wallbox() -> Wallbox:
+def fake() -> FakeRegisters:
+    return FakeRegisters()
+
+
+@pytest.fixture()
+def wallbox(fake: FakeRegisters) -> Wallbox:
     instance = object.__new__(Wallbox)
-    instance._read_register = MagicMock()
-    instance._read_32bit_from_registers = MagicMock()
-    instance._write_register = MagicMock(return_value=True)
+    instance._read_register = fake.read_register
+    instance._read_32bit_from_registers = fake.read_32bit
+    instance._read_registers = fake.read_registers
+    instance._write_register = fake.write_register
     return instance
 
 
-def test_modbus_register_layout_version_valid(wallbox: Wallbox):
-    wallbox._read_register.return_value = 123
+def test_modbus_register_layout_version_valid(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 123
 
     assert wallbox.modbus_register_layout_version == "1.2.3"
-    wallbox._read_register.assert_called_once_with(4, ModbusFunctionCode.READ_INPUT_REGISTER)
+    assert fake.reads == [(4, ModbusFunctionCode.READ_INPUT_REGISTER, True)]
 
 
-def test_modbus_register_layout_version_invalid(wallbox: Wallbox):
-    wallbox._read_register.return_value = 99
+def test_modbus_register_layout_version_invalid(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 99
 
     with pytest.raises(ValueError, match="Unsupported Modbus register layout version"):
         _ = wallbox.modbus_register_layout_version
 
 
-def test_charging_state_known_value(wallbox: Wallbox):
-    wallbox._read_register.return_value = 5
+def test_layout_version_is_read_once(monkeypatch):
+    wallbox = object.__new__(Wallbox)
+    reads = []
+    wallbox.read_register = lambda *args: reads.append(args) or 123
+    wallbox._read_cache = {}
+    wallbox.read_cache_ttl = 0.1
+
+    assert wallbox.modbus_register_layout_version == "1.2.3"
+    monkeypatch.setattr("wallbox_control.modbus.time.monotonic", lambda: 1e9)
+    assert wallbox.modbus_register_layout_version == "1.2.3"
+
+    assert len(reads) == 1
+
+
+def test_charging_state_known_value(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 5
 
     state = wallbox.charging_state
 
     assert state is WALLBOX_CHARGING_STATES[5]
-    wallbox._read_register.assert_called_once_with(5, ModbusFunctionCode.READ_INPUT_REGISTER)
+    assert fake.reads == [(5, ModbusFunctionCode.READ_INPUT_REGISTER, True)]
 
 
-def test_charging_state_unknown_value_raises(wallbox: Wallbox):
-    wallbox._read_register.return_value = 999
+@pytest.mark.parametrize("value", [1, 12, 999])
+def test_charging_state_unknown_value_raises(
+    wallbox: Wallbox, fake: FakeRegisters, value: int
+):
+    fake.value = value
 
     with pytest.raises(ValueError, match="Unknown charging state"):
         _ = wallbox.charging_state
 
 
-def test_pcb_temperature_handles_twos_complement(wallbox: Wallbox):
-    wallbox._read_register.return_value = 0xFF9C
+def test_pcb_temperature_handles_twos_complement(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 0xFF9C
 
     assert wallbox.pcb_temperature == pytest.approx(-10.0, rel=1e-6)
 
 
-def test_ext_lock_state_boolean_translation(wallbox: Wallbox):
-    wallbox._read_register.return_value = 0
+def test_ext_lock_state_boolean_translation(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 0
     assert wallbox.ext_lock_state is True
 
-    wallbox._read_register.return_value = 1
+    fake.value = 1
     assert wallbox.ext_lock_state is False
 
-    wallbox._read_register.return_value = 3
+    fake.value = 3
     with pytest.raises(ValueError, match="Unknown external lock state"):
         _ = wallbox.ext_lock_state
 
 
-def test_energy_since_power_on_reads_combined_registers(wallbox: Wallbox):
-    wallbox._read_32bit_from_registers.return_value = 123456
+def test_energy_since_power_on_reads_combined_registers(
+    wallbox: Wallbox, fake: FakeRegisters
+):
+    fake.value_32bit = 123456
 
     assert wallbox.energy_since_power_on == 123456
-    wallbox._read_32bit_from_registers.assert_called_once_with(
-        15, 16, ModbusFunctionCode.READ_INPUT_REGISTER
-    )
+    assert fake.reads_32bit == [(15, 16, ModbusFunctionCode.READ_INPUT_REGISTER)]
 
 
-def test_energy_since_installation_reads_combined_registers(wallbox: Wallbox):
-    wallbox._read_32bit_from_registers.return_value = 987654
+def test_energy_since_installation_reads_combined_registers(
+    wallbox: Wallbox, fake: FakeRegisters
+):
+    fake.value_32bit = 987654
 
     assert wallbox.energy_since_installation == 987654
-    wallbox._read_32bit_from_registers.assert_called_once_with(
-        17, 18, ModbusFunctionCode.READ_INPUT_REGISTER
-    )
+    assert fake.reads_32bit == [(17, 18, ModbusFunctionCode.READ_INPUT_REGISTER)]
 
 
-def test_modbus_timeout_roundtrip(wallbox: Wallbox):
-    wallbox._read_register.return_value = 250
+def test_modbus_timeout_roundtrip(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 250
     assert wallbox.modbus_timeout == 250
 
-    wallbox._write_register.return_value = True
     wallbox.modbus_timeout = 500
-    wallbox._write_register.assert_called_with(257, 500)
+    assert fake.writes == [(257, 500)]
 
 
-def test_setters_validate_ranges(wallbox: Wallbox):
-    wallbox._write_register.return_value = True
-
+def test_setters_validate_ranges(wallbox: Wallbox, fake: FakeRegisters):
     wallbox.max_current = 16.0
-    wallbox._write_register.assert_called_with(261, 160)
+    assert fake.writes[-1] == (261, 160)
 
     with pytest.raises(ValueError, match="Invalid max current"):
         wallbox.max_current = 5.0
 
     wallbox.failsafe_current = 10.0
-    wallbox._write_register.assert_called_with(262, 100)
+    assert fake.writes[-1] == (262, 100)
 
     with pytest.raises(ValueError, match="Invalid failsafe current"):
         wallbox.failsafe_current = 25.0
 
+    assert len(fake.writes) == 2
+
 
-def test_standby_control_state_validation(wallbox: Wallbox):
-    wallbox._read_register.return_value = 0
+def test_standby_control_state_validation(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 0
     assert wallbox.standby_control is True
 
-    wallbox._read_register.return_value = 4
+    fake.value = 4
     assert wallbox.standby_control is False
 
-    wallbox._read_register.return_value = 2
+    fake.value = 2
     with pytest.raises(ValueError, match="Unknown standby control state"):
         _ = wallbox.standby_control
 
-    wallbox._write_register.return_value = True
     wallbox.standby_control = True
-    wallbox._write_register.assert_called_with(258, 0)
+    assert fake.writes == [(258, 0)]
 
 
-def test_remote_lock_state_validation(wallbox: Wallbox):
-    wallbox._read_register.return_value = 0
+def test_repeated_setter_value_is_written_once():
+    wallbox = object.__new__(Wallbox)
+    writes = []
+    wallbox.write_register = lambda *args: writes.append(args[:2])
+    wallbox._read_cache = {}
+    wallbox._written_values = {}
+
+    wallbox.standby_control = True
+    wallbox.standby_control = True
+    wallbox.standby_control = False
+
+    assert writes == [(258, 0), (258, 4)]
+
+
+def test_remote_lock_state_validation(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 0
     assert wallbox.remote_lock is True
 
-    wallbox._read_register.return_value = 1
+    fake.value = 1
     assert wallbox.remote_lock is False
 
-    wallbox._read_register.return_value = 2
+    fake.value = 2
     with pytest.raises(ValueError, match="Unknown remote lock state"):
         _ = wallbox.remote_lock
 
-    wallbox._write_register.return_value = True
     wallbox.remote_lock = True
-    wallbox._write_register.assert_called_with(259, 0)
+    assert fake.writes == [(259, 0)]
+
+
+def test_register_map_covers_all_getters():
+    assert set(_REGISTER_MAP) == set(Wallbox.OWN_GETTERS)
+
+
+def test_snapshot_reads_adjacent_registers_in_blocks(
+    wallbox: Wallbox, fake: FakeRegisters
+):
+    blocks = {
+        4: [123, 5, 2301, 2302, 2303, 0xFF9C, 230, 231, 232, 0, 1100, 1, 2, 0, 3],
+        257: [250, 0, 1],
+        261: [160, 0],
+    }
+    fake.blocks = lambda start, count, function_code: blocks[start]
+
+    values = wallbox.snapshot()
 
+    assert sorted(fake.block_reads) == [
+        (4, 15, ModbusFunctionCode.READ_INPUT_REGISTER),
+        (257, 3, ModbusFunctionCode.READ_HOLDING_REGISTER),
+        (261, 2, ModbusFunctionCode.READ_HOLDING_REGISTER),
+    ]
+    assert fake.reads == []
+    assert list(values) == list(Wallbox.OWN_GETTERS)
+    assert values["modbus_register_layout_version"] == "1.2.3"
+    assert values["charging_state"] is WALLBOX_CHARGING_STATES[5]
+    assert values["L3_rms"] == pytest.approx(230.3)
+    assert values["pcb_temperature"] == pytest.approx(-10.0)
+    assert values["energy_since_power_on"] == (1 << 16) + 2
+    assert values["energy_since_installation"] == 3
+    assert values["remote_lock"] is False
+    assert values["max_current"] == 16.0
+    assert values["failsafe_current"] == 0.0
+
+
+def test_snapshot_reads_only_requested_properties(
+    wallbox: Wallbox, fake: FakeRegisters
+):
+    fake.blocks = lambda start, count, function_code: [5, 2301]
+
+    values = wallbox.snapshot(["L1_rms", "charging_state"])
+
+    assert fake.block_reads == [(5, 2, ModbusFunctionCode.READ_INPUT_REGISTER)]
+    assert list(values) == ["charging_state", "L1_rms"]
+    assert values["L1_rms"] == pytest.approx(230.1)
+
+
+def test_snapshot_reports_errors_per_property(wallbox: Wallbox, fake: FakeRegisters):
+    def read_registers(start, count, function_code):
+        if start == 257:
+            raise RuntimeError("bus error")
+        if start == 4:
+            return [99] + [0] * 14
+        return [160, 0]
+
+    fake.blocks = read_registers
+
+    values = wallbox.snapshot()
+
+    assert isinstance(values["modbus_register_layout_version"], ValueError)
+    assert values["L1_rms"] == 0.0
+    for name in ("modbus_timeout", "standby_control", "remote_lock"):
+        assert isinstance(values[name], RuntimeError)
+    assert values["max_current"] == 16.0
+
+
+def test_snapshot_falls_back_to_single_reads_when_block_is_rejected(
+    wallbox: Wallbox, fake: FakeRegisters
+):
+    def read_registers(start, count, function_code):
+        if start == 257 and count == 3:
+            raise RuntimeError("rejected") from minimalmodbus.IllegalRequestError(
+                "illegal"
+            )
+        if start == 259:
+            raise RuntimeError("rejected") from minimalmodbus.IllegalRequestError(
+                "illegal"
+            )
+        if start == 4:
+            return [123] + [0] * 14
+        return {257: [250], 258: [4], 261: [160, 0]}[start]
+
+    fake.blocks = read_registers
+
+    values = wallbox.snapshot()
+
+    assert values["modbus_timeout"] == 250
+    assert values["standby_control"] is False
+    assert isinstance(values["remote_lock"], RuntimeError)
+    assert (258, 1, ModbusFunctionCode.READ_HOLDING_REGISTER) in fake.block_reads
+
+
+def test_keepalive_bypasses_read_cache(wallbox: Wallbox, fake: FakeRegisters):
+    fake.value = 123
+
+    assert wallbox.keepalive() == "1.2.3"
+    assert fake.reads == [(4, ModbusFunctionCode.READ_INPUT_REGISTER, False)]
+
+
+@pytest.mark.parametrize("name", list(_REGISTER_MAP))
+def test_property_reads_the_registers_in_register_map(
+    wallbox: Wallbox, fake: FakeRegisters, name: str
+):
+    address, count, function_code, _ = _REGISTER_MAP[name]
+
+    try:
+        getattr(wallbox, name)
+    except ValueError:
+        pass  # 0 is not a valid value for every register
+
+    if count == 1:
+        assert fake.reads == [(address, function_code, True)]
+    else:
+        assert fake.reads_32bit == [(address, address + count - 1, function_code)]
+
+
+def test_properties_are_served_from_snapshot_reads():
+    wallbox = object.__new__(Wallbox)
+    block_reads = []
+    single_reads = []
+
+    def read_registers(start, count, function_code):
+        block_reads.append((start, count))
+        # A valid layout version and charging state; everything else 0
+        return [{4: 123, 5: 5}.get(start + i, 0) for i in range(count)]
+
+    wallbox.read_registers = read_registers
+    wallbox.read_register = lambda *args: single_reads.append(args)
+    wallbox._read_cache = {}
+    wallbox.read_cache_ttl = 0.1
+
+    wallbox.snapshot()
+    for name in Wallbox.OWN_GETTERS:
+        try:
+            getattr(wallbox, name)
+        except ValueError:
+            pass  # 0 is not a valid value for every register
+
+    assert len(block_reads) == 3
+    assert single_reads == []
+
+
+def test_rejected_block_falls_back_without_reconnecting():
+    wallbox = object.__new__(Wallbox)
+    wallbox.logger = logging.getLogger("test")
+    wallbox.last_transaction_time = 0.0
+    wallbox._read_cache = {}
+    wallbox.read_cache_ttl = 0.1
+    reconnects = []
+    wallbox._reconnect_serial = lambda: reconnects.append(True) or True
+
+    def read_registers(start, count, function_code):
+        if start == 257 and count == 3:
+            raise minimalmodbus.IllegalRequestError("illegal data address")
+        if start == 4:
+            return [123] + [0] * 14
+        return {257: [250], 258: [4], 259: [1], 261: [160, 0]}[start]
+
+    wallbox.read_registers = read_registers
+
+    values = wallbox.snapshot()
+
+    assert reconnects == []
+    assert values["modbus_timeout"] == 250
+    assert values["standby_control"] is False
+    assert values["remote_lock"] is False
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from wallbox_control.limits import (
+    CurrentLimitManager,
+    HardwareInputLimiter,
+    LimitDecision,
+)
+from wallbox_control.webserver import WebServerController
+
+
+class _StatusController:
+    def __init__(self) -> None:
+        self.status: dict[str, Any] = {"max_current": 16.0, "charging_state": "A1"}
+        self.limits = CurrentLimitManager()
+
+    def get_all_properties(self) -> dict[str, Any]:
+        return {
+            **self.status,
+            "current_limit": self.limits.debug_snapshot(),
+            "snapshot_age": 0.25,
+        }
+
+    def request_manual_max_current(self, value: float) -> LimitDecision:
+        return self.limits.request_manual(value)
+
+
+@pytest.fixture()
+def controller() -> _StatusController:
+    return _StatusController()
+
+
+@pytest.fixture()
+def client(controller: _StatusController) -> TestClient:
+    return TestClient(WebServerController(controller).app)
+
+
+def test_status_returns_body_with_etag(client: TestClient):
+    response = client.get("/status")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"max_current", "charging_state", "current_limit"}
+    assert body["max_current"] == 16.0
+    assert response.headers["ETag"].startswith('"')
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.headers["X-Snapshot-Age"] == "0.250"
+
+
+def test_status_not_modified_when_etag_matches(client: TestClient):
+    etag = client.get("/status").headers["ETag"]
+
+    response = client.get("/status", headers={"If-None-Match": etag})
+    listed = client.get("/status", headers={"If-None-Match": f'"other", {etag}'})
+
+    assert response.status_code == listed.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("if_none_match", ["W/{etag}", "*", '"other", W/{etag}'])
+def test_status_not_modified_for_weak_and_wildcard_tags(
+    client: TestClient, if_none_match: str
+):
+    etag = client.get("/status").headers["ETag"]
+
+    response = client.get(
+        "/status", headers={"If-None-Match": if_none_match.format(etag=etag)}
+    )
+
+    assert response.status_code == 304
+
+
+def test_status_change_gets_new_etag(client: TestClient, controller: _StatusController):
+    etag = client.get("/status").headers["ETag"]
+    controller.status["max_current"] = 6.0
+
+    response = client.get("/status", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["max_current"] == 6.0
+
+
+def test_status_includes_read_only_limit_sources(
+    client: TestClient, controller: _StatusController
+):
+    controller.limits.apply_override_snapshot(HardwareInputLimiter().evaluate(True))
+
+    response = client.get("/status")
+
+    assert response.status_code == 200
+    sources = response.json()["current_limit"]["sources"]
+    assert sources["hardware_inputs"]["current_amps"] == 6.0
+    assert sources["hardware_inputs"]["details"]["inputs"] == {"GPIO6": True}
+
+
+def test_overridden_request_reports_limit_debug(
+    client: TestClient, controller: _StatusController
+):
+    controller.limits.apply_override_snapshot(HardwareInputLimiter().evaluate(True))
+
+    response = client.post("/max_current", json={"max_current": 16.0})
+
+    assert response.status_code == 409
+    detail = response.json()["detail"]
+    assert detail["applied_current"] == 6.0
+    assert detail["limit_debug"]["hardware_inputs"]["current_amps"] == 6.0